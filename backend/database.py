@@ -1,5 +1,14 @@
-from supabase import create_client
+from supabase import Client, ClientOptions, SupabaseAuthClient
+from gotrue import SyncGoTrueClient
+from postgrest import SyncPostgrestClient
+from postgrest.exceptions import APIError
+from utils.http_transport import build_transport
 from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import httpx
+import queue
 import os
 
 load_dotenv()
@@ -7,4 +16,125 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Upper bound on concurrent blocking Supabase calls per worker process
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", "16"))
+
+# HTTP transport shared by PostgREST and auth calls from every service module
+SUPABASE_HTTP_MAX_CONNECTIONS = int(os.getenv("SUPABASE_HTTP_MAX_CONNECTIONS", "100"))
+SUPABASE_HTTP_MAX_KEEPALIVE = int(os.getenv("SUPABASE_HTTP_MAX_KEEPALIVE", str(DB_MAX_WORKERS)))
+SUPABASE_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_HTTP_KEEPALIVE_EXPIRY", "30"))
+SUPABASE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() in ("1", "true", "yes")
+SUPABASE_HTTP_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_HTTP_CONNECT_TIMEOUT", "5"))
+SUPABASE_HTTP_READ_TIMEOUT = float(os.getenv("SUPABASE_HTTP_READ_TIMEOUT", "30"))
+SUPABASE_HTTP_RETRIES = int(os.getenv("SUPABASE_HTTP_RETRIES", "2"))
+SUPABASE_HTTP_RETRY_BACKOFF = float(os.getenv("SUPABASE_HTTP_RETRY_BACKOFF", "0.1"))
+SUPABASE_HTTP_CONNECT_RETRIES = int(os.getenv("SUPABASE_HTTP_CONNECT_RETRIES", "2"))
+
+http_transport = build_transport(
+    max_connections=SUPABASE_HTTP_MAX_CONNECTIONS,
+    max_keepalive=SUPABASE_HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=SUPABASE_HTTP_KEEPALIVE_EXPIRY,
+    http2=SUPABASE_HTTP2,
+    retries=SUPABASE_HTTP_RETRIES,
+    backoff=SUPABASE_HTTP_RETRY_BACKOFF,
+    connect_retries=SUPABASE_HTTP_CONNECT_RETRIES,
+)
+_http_timeout = httpx.Timeout(SUPABASE_HTTP_READ_TIMEOUT, connect=SUPABASE_HTTP_CONNECT_TIMEOUT)
+
+def _http_client(**kwargs) -> httpx.Client:
+    return httpx.Client(transport=http_transport, timeout=_http_timeout, follow_redirects=True, **kwargs)
+
+class _PostgrestClient(SyncPostgrestClient):
+    def create_session(self, base_url, headers, timeout, verify=True, proxy=None):
+        return _http_client(base_url=base_url, headers=headers)
+
+class _SupabaseClient(Client):
+    """supabase-py client whose PostgREST and auth calls use the shared transport"""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=None, verify=True, proxy=None):
+        return _PostgrestClient(rest_url, headers=headers, schema=schema)
+
+    @staticmethod
+    def _init_supabase_auth_client(auth_url, client_options, verify=True, proxy=None):
+        return SupabaseAuthClient(
+            url=auth_url,
+            auto_refresh_token=client_options.auto_refresh_token,
+            persist_session=client_options.persist_session,
+            storage=client_options.storage,
+            headers=client_options.headers,
+            flow_type=client_options.flow_type,
+            http_client=_http_client(),
+        )
+
+# The shared client never holds a user session. supabase-py copies a signed-in
+# user's token into the PostgREST headers, so one sign-in on it would make every
+# later query from every request run as that user. Sign-ins go through run_auth.
+supabase = _SupabaseClient.create(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(
+    auto_refresh_token=False,
+    persist_session=False,
+))
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="revx-db")
+
+async def run_sync(func, *args, **kwargs):
+    """Run a blocking Supabase call on the bounded DB worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+def http_pool_stats():
+    """Utilization of the shared HTTP connection pool and the DB worker threads"""
+    return {
+        **http_transport.stats(),
+        "db_max_workers": DB_MAX_WORKERS,
+        "db_pending_calls": _db_executor._work_queue.qsize(),
+    }
+
+async def execute(query):
+    """Execute a PostgREST query builder without blocking the event loop"""
+    return await run_sync(query.execute)
+
+def _execute_raw(query) -> bytes:
+    response = query.session.request(
+        query.http_method,
+        query.path,
+        json=query.json,
+        params=query.params,
+        headers=query.headers,
+    )
+    if not response.is_success:
+        raise APIError(response.json())
+    return response.content
+
+async def execute_raw(query) -> bytes:
+    """Execute a PostgREST query and return the JSON body as bytes, without decoding it"""
+    return await run_sync(_execute_raw, query)
+
+# Lightweight GoTrue clients, each with its own in-memory session. At most one
+# is checked out per DB worker thread, so the pool never outgrows DB_MAX_WORKERS.
+_auth_http = _http_client()
+_auth_clients: "queue.SimpleQueue[SyncGoTrueClient]" = queue.SimpleQueue()
+
+def _new_auth_client() -> SyncGoTrueClient:
+    return SyncGoTrueClient(
+        url=f"{SUPABASE_URL}/auth/v1",
+        headers={"apiKey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        auto_refresh_token=False,
+        persist_session=False,
+        http_client=_auth_http,
+    )
+
+def _with_auth_client(func, args, kwargs):
+    try:
+        client = _auth_clients.get_nowait()
+    except queue.Empty:
+        client = _new_auth_client()
+    try:
+        return func(client, *args, **kwargs)
+    finally:
+        client._remove_session()
+        _auth_clients.put(client)
+
+async def run_auth(func, *args, **kwargs):
+    """Run `func(auth_client, ...)` on a pooled auth client whose session is private to this call"""
+    return await run_sync(_with_auth_client, func, args, kwargs)
@@ -14,6 +14,15 @@ BEGIN
             'title', p.title,
             'description', p.description,
             'owner_id', p.owner_id,
+            'avg_rating', COALESCE(s.avg_rating, 0),
+            'review_count', COALESCE(s.review_count, 0),
+            'rating_histogram', json_build_object(
+                '1', COALESCE(s.star_1, 0),
+                '2', COALESCE(s.star_2, 0),
+                '3', COALESCE(s.star_3, 0),
+                '4', COALESCE(s.star_4, 0),
+                '5', COALESCE(s.star_5, 0)
+            ),
             'owner', (
                 SELECT json_build_object(
                     'id', prof.id, 
@@ -78,6 +87,8 @@ BEGIN
         ) INTO result
     FROM 
         revx.projects p
+    LEFT JOIN 
+        revx.project_stats s ON s.project_id = p.id
     WHERE 
         p.id = get_project_with_details.project_id;
     
@@ -85,60 +96,114 @@ BEGIN
 END;
 $$;
 
+-- Function : project_tag_list
+-- A project's tags as [{"tag_id", "tag_name"}], as embedded in listings.
+CREATE OR REPLACE FUNCTION project_tag_list(p_project_id bigint)
+RETURNS json
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    SELECT coalesce(json_agg(
+        json_build_object(
+            'tag_id', t.id,
+            'tag_name', t.tag_name
+        )
+    ), '[]'::json)
+    FROM "revx"."project_R_tag" pt
+    JOIN revx.tags t ON pt.tag_id = t.id
+    WHERE pt.project_id = p_project_id;
+$$;
+
+-- Function : project_cover_image
+-- The first image of a project as a one-element array ('[]' without images),
+-- so card listings keep the images[0] shape of the full view.
+CREATE OR REPLACE FUNCTION project_cover_image(p_project_id bigint)
+RETURNS json
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    SELECT coalesce(json_agg(pi.image_link), '[]'::json)
+    FROM (
+        SELECT pi.image_link
+        FROM revx.project_images pi
+        WHERE pi.project_id = p_project_id
+        ORDER BY pi.id
+        LIMIT 1
+    ) pi;
+$$;
+
+-- Function : project_fields
+-- Sparse fieldsets: keep only the keys of p_project named in p_fields, in
+-- their original order. NULL p_fields returns the object unchanged.
+CREATE OR REPLACE FUNCTION project_fields(p_project json, p_fields text[])
+RETURNS json
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT CASE
+        WHEN p_fields IS NULL OR p_project IS NULL THEN p_project
+        ELSE (
+            SELECT coalesce(json_object_agg(f.key, f.value), '{}'::json)
+            FROM json_each(p_project) f
+            WHERE f.key = ANY(p_fields)
+        )
+    END;
+$$;
+
 -- Function : get_user_projects_with_images
-CREATE OR REPLACE FUNCTION get_user_projects_with_images(p_user_id uuid)
+-- The parameter is named user_id, matching the body and the RPC callers;
+-- renaming a parameter or adding one needs the old signature dropped first.
+-- p_view and p_fields work as in list_projects_page_payload.
+DROP FUNCTION IF EXISTS get_user_projects_with_images(uuid);
+CREATE OR REPLACE FUNCTION get_user_projects_with_images(
+    user_id uuid,
+    p_view text DEFAULT 'full',
+    p_fields text[] DEFAULT NULL
+)
 RETURNS SETOF json
 LANGUAGE plpgsql
 SECURITY INVOKER
 AS $$
 BEGIN
     RETURN QUERY
-    WITH project_images AS (
-        SELECT 
-            p.id as project_id,
-            json_agg(pi.image_link) FILTER (WHERE pi.image_link IS NOT NULL) as images
-        FROM 
-            revx.project_images pi
-        RIGHT JOIN 
-            revx.projects p ON p.id = pi.project_id
-        WHERE 
-            p.owner_id = user_id
-        GROUP BY 
-            p.id
-    )
     SELECT 
-        json_build_object(
-            'id', p.id,
-            'title', p.title,
-            'description', p.description,
-            'owner_id', p.owner_id,
-            'created_at', p.created_at,
-            'images', COALESCE(pi.images, '[]'::json),
-            'tags', (
-                SELECT coalesce(json_agg(
-                    json_build_object(
-                        'tag_id', t.id,
-                        'tag_name', t.tag_name
-                    )
-                ), '[]'::json)
-                FROM "revx"."project_R_tag" pt
-                JOIN revx.tags t ON pt.tag_id = t.id
-                WHERE pt.project_id = p.id
+        project_fields(CASE 
+            WHEN p_view = 'card' THEN json_build_object(
+                'id', p.id,
+                'title', p.title,
+                'description', left(p.description, 160),
+                'created_at', p.created_at,
+                'images', project_cover_image(p.id),
+                'tags', project_tag_list(p.id)
             )
-        )
+            ELSE json_build_object(
+                'id', p.id,
+                'title', p.title,
+                'description', p.description,
+                'owner_id', p.owner_id,
+                'created_at', p.created_at,
+                'images', (
+                    SELECT coalesce(json_agg(pi.image_link ORDER BY pi.id), '[]'::json)
+                    FROM revx.project_images pi
+                    WHERE pi.project_id = p.id
+                ),
+                'tags', project_tag_list(p.id)
+            )
+        END, p_fields)
     FROM 
         revx.projects p
-    LEFT JOIN 
-        project_images pi ON p.id = pi.project_id
     WHERE 
-        p.owner_id = user_id
+        p.owner_id = get_user_projects_with_images.user_id
     ORDER BY 
         p.created_at DESC, p.id;
 END;
 $$;
 
 -- Function : get_user_reviews
-CREATE OR REPLACE FUNCTION get_user_reviews(p_user_id uuid)
+DROP FUNCTION IF EXISTS get_user_reviews(uuid);
+CREATE OR REPLACE FUNCTION get_user_reviews(user_id uuid)
 RETURNS SETOF json
 LANGUAGE plpgsql
 SECURITY INVOKER
@@ -222,25 +287,896 @@ BEGIN
         )
     )
     FROM (
-        -- Subquery to calculate average ratings and order projects
+        -- Average ratings come precomputed from project_stats
         SELECT 
             p.id, 
             p.created_at, 
             p.title, 
             p.description, 
             p.owner_id,
-            AVG(r.rating)::numeric(3,2) as avg_rating
+            s.avg_rating
         FROM 
             revx.projects p
         LEFT JOIN 
-            revx.reviews r ON p.id = r.project_id
-        GROUP BY 
-            p.id, p.created_at, p.title, p.description, p.owner_id
+            revx.project_stats s ON s.project_id = p.id
         ORDER BY 
-            -- Projects with ratings come first (DESC order), then projects with no ratings
-            CASE WHEN AVG(r.rating) IS NULL THEN 0 ELSE 1 END DESC,
-            AVG(r.rating) DESC,
+            -- Unrated projects have avg_rating 0, so rated projects come first
+            COALESCE(s.avg_rating, 0) DESC,
             p.created_at DESC  -- Secondary sort by creation date (newest first)
     ) p;
 END;
-$$;
\ No newline at end of file
+$$;
+
+-- Function : list_projects_page
+-- Keyset-paginated catalog ordered by (avg_rating, created_at, id) descending,
+-- served from project_stats_catalog_idx.
+-- Pass the sort key of the last row seen as the cursor; NULLs start from the top.
+-- p_view 'card' builds the slim grid projection (truncated description, first
+-- image, tags, rating) and skips the owner lookup; anything else is the full view.
+DROP FUNCTION IF EXISTS list_projects_page(integer, numeric, timestamp with time zone, bigint);
+CREATE OR REPLACE FUNCTION list_projects_page(
+    p_limit integer DEFAULT 24,
+    p_cursor_rating numeric DEFAULT NULL,
+    p_cursor_created_at timestamp with time zone DEFAULT NULL,
+    p_cursor_id bigint DEFAULT NULL,
+    p_view text DEFAULT 'full'
+)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH page AS (
+        -- Walks project_stats_catalog_idx from the cursor; no aggregation
+        SELECT 
+            p.id, 
+            p.created_at, 
+            p.title, 
+            p.description, 
+            p.owner_id,
+            s.avg_rating
+        FROM 
+            revx.project_stats s
+        JOIN 
+            revx.projects p ON p.id = s.project_id
+        WHERE 
+            p_cursor_id IS NULL
+            OR (s.avg_rating, s.project_created_at, s.project_id)
+                < (p_cursor_rating, p_cursor_created_at, p_cursor_id)
+        ORDER BY 
+            s.avg_rating DESC, s.project_created_at DESC, s.project_id DESC
+        LIMIT p_limit
+    )
+    SELECT 
+        CASE 
+            WHEN p_view = 'card' THEN json_build_object(
+                'id', p.id,
+                'created_at', p.created_at,
+                'title', p.title,
+                'description', left(p.description, 160),
+                'avg_rating', p.avg_rating,
+                'images', project_cover_image(p.id),
+                'tags', project_tag_list(p.id)
+            )
+            ELSE json_build_object(
+                'id', p.id,
+                'created_at', p.created_at,
+                'title', p.title,
+                'description', p.description,
+                'owner_id', p.owner_id,
+                'avg_rating', p.avg_rating,
+                'owner', (
+                    SELECT json_build_object(
+                        'id', prof.id, 
+                        'username', prof.username, 
+                        'full_name', prof.full_name, 
+                        'bio', prof.bio, 
+                        'avatar', prof.avatar
+                    )
+                    FROM revx.profile prof WHERE prof.id = p.owner_id
+                ),
+                'images', (
+                    SELECT coalesce(json_agg(pi.image_link ORDER BY pi.id), '[]'::json)
+                    FROM revx.project_images pi
+                    WHERE pi.project_id = p.id
+                ),
+                'tags', project_tag_list(p.id)
+            )
+        END
+    FROM 
+        page p
+    ORDER BY 
+        p.avg_rating DESC, p.created_at DESC, p.id DESC;
+END;
+$$;
+
+-- Function : list_projects_page_payload
+-- One catalog page as the finished response payload {"data": [...],
+-- "next_cursor": ...}, so the API can splice it into its envelope without
+-- decoding it. next_cursor is the same base64url JSON key that
+-- utils/pagination.encode_cursor produces, or NULL on the last page.
+-- The cursor is read before p_fields trims the rows, so it works for any fieldset.
+DROP FUNCTION IF EXISTS list_projects_page_payload(integer, numeric, timestamp with time zone, bigint);
+CREATE OR REPLACE FUNCTION list_projects_page_payload(
+    p_limit integer DEFAULT 24,
+    p_cursor_rating numeric DEFAULT NULL,
+    p_cursor_created_at timestamp with time zone DEFAULT NULL,
+    p_cursor_id bigint DEFAULT NULL,
+    p_view text DEFAULT 'full',
+    p_fields text[] DEFAULT NULL
+)
+RETURNS json
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+    WITH page AS (
+        SELECT project, n
+        FROM list_projects_page(p_limit + 1, p_cursor_rating, p_cursor_created_at, p_cursor_id, p_view)
+            WITH ORDINALITY AS t(project, n)
+    )
+    SELECT json_build_object(
+        'data', COALESCE(
+            (SELECT json_agg(project_fields(project, p_fields) ORDER BY n) FROM page WHERE n <= p_limit),
+            '[]'::json
+        ),
+        'next_cursor', (
+            SELECT rtrim(translate(replace(encode(convert_to(
+                json_build_array(project->'avg_rating', project->'created_at', project->'id')::text,
+                'UTF8'), 'base64'), E'\n', ''), '+/', '-_'), '=')
+            FROM page
+            WHERE n = p_limit
+              AND EXISTS (SELECT 1 FROM page WHERE n > p_limit)
+        )
+    );
+$$;
+
+-- Function : search_projects
+-- Relevance-ordered keyword search with optional tag filtering (projects with
+-- any of p_tag_ids). Keyset-paginated on (rank, id) descending.
+-- p_view and p_fields work as in list_projects_page_payload; callers paging through
+-- results keep rank and id in p_fields.
+DROP FUNCTION IF EXISTS search_projects(text, bigint[], integer, numeric, bigint);
+CREATE OR REPLACE FUNCTION search_projects(
+    p_query text DEFAULT NULL,
+    p_tag_ids bigint[] DEFAULT NULL,
+    p_limit integer DEFAULT 24,
+    p_cursor_rank numeric DEFAULT NULL,
+    p_cursor_id bigint DEFAULT NULL,
+    p_view text DEFAULT 'full',
+    p_fields text[] DEFAULT NULL
+)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    ts_query tsquery;
+BEGIN
+    IF coalesce(trim(p_query), '') <> '' THEN
+        ts_query := websearch_to_tsquery('english', p_query);
+    END IF;
+
+    RETURN QUERY
+    WITH matches AS (
+        SELECT 
+            p.id, 
+            p.created_at, 
+            p.title, 
+            p.description, 
+            p.owner_id,
+            CASE 
+                WHEN ts_query IS NULL THEN 0
+                ELSE round(ts_rank(p.search_vector, ts_query)::numeric, 6)
+            END AS rank
+        FROM 
+            revx.projects p
+        WHERE 
+            (ts_query IS NULL OR p.search_vector @@ ts_query)
+            AND (
+                coalesce(cardinality(p_tag_ids), 0) = 0
+                OR EXISTS (
+                    SELECT 1 
+                    FROM "revx"."project_R_tag" pt 
+                    WHERE pt.project_id = p.id AND pt.tag_id = ANY(p_tag_ids)
+                )
+            )
+    ),
+    page AS (
+        SELECT * 
+        FROM matches m
+        WHERE 
+            p_cursor_id IS NULL
+            OR (m.rank, m.id) < (p_cursor_rank, p_cursor_id)
+        ORDER BY 
+            m.rank DESC, m.id DESC
+        LIMIT p_limit
+    )
+    SELECT 
+        project_fields(CASE 
+            WHEN p_view = 'card' THEN json_build_object(
+                'id', p.id,
+                'created_at', p.created_at,
+                'title', p.title,
+                'description', left(p.description, 160),
+                'rank', p.rank,
+                'avg_rating', (
+                    SELECT COALESCE(s.avg_rating, 0)
+                    FROM revx.project_stats s
+                    WHERE s.project_id = p.id
+                ),
+                'images', project_cover_image(p.id),
+                'tags', project_tag_list(p.id)
+            )
+            ELSE json_build_object(
+                'id', p.id,
+                'created_at', p.created_at,
+                'title', p.title,
+                'description', p.description,
+                'owner_id', p.owner_id,
+                'rank', p.rank,
+                'avg_rating', (
+                    SELECT COALESCE(s.avg_rating, 0)
+                    FROM revx.project_stats s
+                    WHERE s.project_id = p.id
+                ),
+                'owner', (
+                    SELECT json_build_object(
+                        'id', prof.id, 
+                        'username', prof.username, 
+                        'full_name', prof.full_name, 
+                        'bio', prof.bio, 
+                        'avatar', prof.avatar
+                    )
+                    FROM revx.profile prof WHERE prof.id = p.owner_id
+                ),
+                'images', (
+                    SELECT coalesce(json_agg(pi.image_link ORDER BY pi.id), '[]'::json)
+                    FROM revx.project_images pi
+                    WHERE pi.project_id = p.id
+                ),
+                'tags', project_tag_list(p.id)
+            )
+        END, p_fields)
+    FROM 
+        page p
+    ORDER BY 
+        p.rank DESC, p.id DESC;
+END;
+$$;
+
+-- Trigger : init_project_stats
+-- Every project gets a zeroed stats row when it is created.
+CREATE OR REPLACE FUNCTION init_project_stats()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO revx.project_stats (project_id, project_created_at)
+    VALUES (NEW.id, NEW.created_at)
+    ON CONFLICT (project_id) DO NOTHING;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS projects_init_stats ON revx.projects;
+CREATE TRIGGER projects_init_stats
+AFTER INSERT ON revx.projects
+FOR EACH ROW EXECUTE FUNCTION init_project_stats();
+
+-- Function : bump_project_stats
+-- Adds (p_delta = 1) or removes (p_delta = -1) one rating from a project's
+-- aggregates. The UPDATE row lock serializes concurrent reviews.
+CREATE OR REPLACE FUNCTION bump_project_stats(p_project_id bigint, p_rating bigint, p_delta integer)
+RETURNS void
+LANGUAGE sql
+AS $$
+    UPDATE revx.project_stats
+    SET 
+        review_count = review_count + p_delta,
+        rating_sum = rating_sum + p_delta * p_rating,
+        star_1 = star_1 + CASE WHEN p_rating = 1 THEN p_delta ELSE 0 END,
+        star_2 = star_2 + CASE WHEN p_rating = 2 THEN p_delta ELSE 0 END,
+        star_3 = star_3 + CASE WHEN p_rating = 3 THEN p_delta ELSE 0 END,
+        star_4 = star_4 + CASE WHEN p_rating = 4 THEN p_delta ELSE 0 END,
+        star_5 = star_5 + CASE WHEN p_rating = 5 THEN p_delta ELSE 0 END,
+        updated_at = now()
+    WHERE project_id = p_project_id;
+$$;
+
+-- Trigger : apply_review_to_project_stats
+-- Keeps project_stats in step with every review insert, delete or re-rating,
+-- inside the same transaction as the review change.
+CREATE OR REPLACE FUNCTION apply_review_to_project_stats()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM bump_project_stats(OLD.project_id, OLD.rating, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM bump_project_stats(NEW.project_id, NEW.rating, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS reviews_apply_project_stats ON revx.reviews;
+CREATE TRIGGER reviews_apply_project_stats
+AFTER INSERT OR DELETE OR UPDATE OF rating, project_id ON revx.reviews
+FOR EACH ROW EXECUTE FUNCTION apply_review_to_project_stats();
+
+-- Backfill : project_stats for projects and reviews that predate the triggers
+INSERT INTO revx.project_stats (
+    project_id, project_created_at, review_count, rating_sum,
+    star_1, star_2, star_3, star_4, star_5
+)
+SELECT 
+    p.id,
+    p.created_at,
+    count(r.id),
+    coalesce(sum(r.rating), 0),
+    count(r.id) FILTER (WHERE r.rating = 1),
+    count(r.id) FILTER (WHERE r.rating = 2),
+    count(r.id) FILTER (WHERE r.rating = 3),
+    count(r.id) FILTER (WHERE r.rating = 4),
+    count(r.id) FILTER (WHERE r.rating = 5)
+FROM 
+    revx.projects p
+LEFT JOIN 
+    revx.reviews r ON r.project_id = p.id
+GROUP BY 
+    p.id, p.created_at
+ON CONFLICT (project_id) DO UPDATE SET
+    review_count = EXCLUDED.review_count,
+    rating_sum = EXCLUDED.rating_sum,
+    star_1 = EXCLUDED.star_1,
+    star_2 = EXCLUDED.star_2,
+    star_3 = EXCLUDED.star_3,
+    star_4 = EXCLUDED.star_4,
+    star_5 = EXCLUDED.star_5,
+    updated_at = now();
+
+-- Function : admin_list_users
+-- One page of profiles joined with their auth emails. SECURITY DEFINER because
+-- auth.users is not readable by API roles; execution is limited to the backend.
+CREATE OR REPLACE FUNCTION admin_list_users(p_limit integer DEFAULT 100, p_offset integer DEFAULT 0)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = revx, public
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        (to_jsonb(prof) || jsonb_build_object('email', u.email))::json
+    FROM 
+        revx.profile prof
+    LEFT JOIN 
+        auth.users u ON u.id = prof.id
+    ORDER BY 
+        prof.created_at DESC, prof.id
+    LIMIT p_limit
+    OFFSET p_offset;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION admin_list_users(integer, integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION admin_list_users(integer, integer) TO service_role;
+
+-- Function : admin_list_projects
+-- One page of projects with owner usernames and precomputed average ratings.
+CREATE OR REPLACE FUNCTION admin_list_projects(p_limit integer DEFAULT 100, p_offset integer DEFAULT 0)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        json_build_object(
+            'id', p.id,
+            'title', p.title,
+            'owner_id', p.owner_id,
+            'owner_username', COALESCE(prof.username, 'Unknown'),
+            'created_at', p.created_at,
+            'avg_rating', COALESCE(s.avg_rating, 0)
+        )
+    FROM 
+        revx.projects p
+    LEFT JOIN 
+        revx.profile prof ON prof.id = p.owner_id
+    LEFT JOIN 
+        revx.project_stats s ON s.project_id = p.id
+    ORDER BY 
+        p.created_at DESC, p.id DESC
+    LIMIT p_limit
+    OFFSET p_offset;
+END;
+$$;
+
+-- Function : admin_export_projects
+-- Flat project rows for the admin export, keyset-paged by id so each page is
+-- an index range scan however deep the export goes. Pass the last id seen.
+CREATE OR REPLACE FUNCTION admin_export_projects(p_after_id bigint DEFAULT NULL, p_limit integer DEFAULT 1000)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        json_build_object(
+            'id', p.id,
+            'title', p.title,
+            'description', p.description,
+            'owner_id', p.owner_id,
+            'owner_username', prof.username,
+            'created_at', p.created_at,
+            'review_count', COALESCE(s.review_count, 0),
+            'avg_rating', COALESCE(s.avg_rating, 0),
+            'tags', (
+                SELECT string_agg(t.tag_name, ', ' ORDER BY t.tag_name)
+                FROM "revx"."project_R_tag" pt
+                JOIN revx.tags t ON t.id = pt.tag_id
+                WHERE pt.project_id = p.id
+            )
+        )
+    FROM 
+        revx.projects p
+    LEFT JOIN 
+        revx.profile prof ON prof.id = p.owner_id
+    LEFT JOIN 
+        revx.project_stats s ON s.project_id = p.id
+    WHERE 
+        p_after_id IS NULL OR p.id > p_after_id
+    ORDER BY 
+        p.id
+    LIMIT p_limit;
+END;
+$$;
+
+-- Function : admin_export_reviews
+CREATE OR REPLACE FUNCTION admin_export_reviews(p_after_id bigint DEFAULT NULL, p_limit integer DEFAULT 1000)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        json_build_object(
+            'id', r.id,
+            'project_id', r.project_id,
+            'project_title', p.title,
+            'user_id', r.user_id,
+            'username', prof.username,
+            'rating', r.rating,
+            'review', r.review,
+            'created_at', r.created_at
+        )
+    FROM 
+        revx.reviews r
+    LEFT JOIN 
+        revx.projects p ON p.id = r.project_id
+    LEFT JOIN 
+        revx.profile prof ON prof.id = r.user_id
+    WHERE 
+        p_after_id IS NULL OR r.id > p_after_id
+    ORDER BY 
+        r.id
+    LIMIT p_limit;
+END;
+$$;
+
+-- Function : admin_export_users
+-- SECURITY DEFINER for the auth emails, like admin_list_users.
+CREATE OR REPLACE FUNCTION admin_export_users(p_after_id uuid DEFAULT NULL, p_limit integer DEFAULT 1000)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = revx, public
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        json_build_object(
+            'id', prof.id,
+            'username', prof.username,
+            'full_name', prof.full_name,
+            'email', u.email,
+            'is_admin', COALESCE(prof.is_admin, false),
+            'created_at', prof.created_at,
+            'project_count', (SELECT count(*) FROM revx.projects p WHERE p.owner_id = prof.id),
+            'review_count', (SELECT count(*) FROM revx.reviews r WHERE r.user_id = prof.id)
+        )
+    FROM 
+        revx.profile prof
+    LEFT JOIN 
+        auth.users u ON u.id = prof.id
+    WHERE 
+        p_after_id IS NULL OR prof.id > p_after_id
+    ORDER BY 
+        prof.id
+    LIMIT p_limit;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION admin_export_users(uuid, integer) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION admin_export_users(uuid, integer) TO service_role;
+
+-- Function : estimated_row_count
+-- Planner row estimate from pg_class; -1 when the table was never analyzed.
+CREATE OR REPLACE FUNCTION estimated_row_count(p_table regclass)
+RETURNS bigint
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT reltuples::bigint FROM pg_catalog.pg_class WHERE oid = p_table;
+$$;
+
+-- Function : get_dashboard_metrics
+-- All admin dashboard counters in one call. Tables listed in
+-- p_estimate_tables ('profile', 'projects', 'reviews') use planner estimates
+-- for their totals instead of a full count.
+CREATE OR REPLACE FUNCTION get_dashboard_metrics(
+    p_since timestamp with time zone DEFAULT now() - interval '30 days',
+    p_estimate_tables text[] DEFAULT '{}'
+)
+RETURNS json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    total_users bigint;
+    total_projects bigint;
+    total_reviews bigint;
+BEGIN
+    IF 'profile' = ANY(p_estimate_tables) THEN
+        total_users := estimated_row_count('revx.profile');
+    END IF;
+    IF total_users IS NULL OR total_users < 0 THEN
+        SELECT count(*) INTO total_users FROM revx.profile;
+    END IF;
+
+    IF 'projects' = ANY(p_estimate_tables) THEN
+        total_projects := estimated_row_count('revx.projects');
+    END IF;
+    IF total_projects IS NULL OR total_projects < 0 THEN
+        SELECT count(*) INTO total_projects FROM revx.projects;
+    END IF;
+
+    IF 'reviews' = ANY(p_estimate_tables) THEN
+        total_reviews := estimated_row_count('revx.reviews');
+    END IF;
+    IF total_reviews IS NULL OR total_reviews < 0 THEN
+        SELECT count(*) INTO total_reviews FROM revx.reviews;
+    END IF;
+
+    RETURN json_build_object(
+        'total_users', total_users,
+        'total_projects', total_projects,
+        'total_reviews', total_reviews,
+        'recent_users', (SELECT count(*) FROM revx.profile WHERE created_at >= p_since),
+        'recent_projects', (SELECT count(*) FROM revx.projects WHERE created_at >= p_since)
+    );
+END;
+$$;
+
+-- Trigger : record_daily_activity
+-- Adds one to the rollup column for the table that fired (TG_ARGV[0]).
+CREATE OR REPLACE FUNCTION record_daily_activity()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    activity_day date := (coalesce(NEW.created_at, now()) AT TIME ZONE 'UTC')::date;
+BEGIN
+    IF TG_ARGV[0] = 'signups' THEN
+        INSERT INTO revx.daily_activity (day, signups) VALUES (activity_day, 1)
+        ON CONFLICT (day) DO UPDATE SET signups = revx.daily_activity.signups + 1;
+    ELSIF TG_ARGV[0] = 'projects' THEN
+        INSERT INTO revx.daily_activity (day, projects) VALUES (activity_day, 1)
+        ON CONFLICT (day) DO UPDATE SET projects = revx.daily_activity.projects + 1;
+    ELSIF TG_ARGV[0] = 'reviews' THEN
+        INSERT INTO revx.daily_activity (day, reviews) VALUES (activity_day, 1)
+        ON CONFLICT (day) DO UPDATE SET reviews = revx.daily_activity.reviews + 1;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS profile_record_daily_activity ON revx.profile;
+CREATE TRIGGER profile_record_daily_activity
+AFTER INSERT ON revx.profile
+FOR EACH ROW EXECUTE FUNCTION record_daily_activity('signups');
+
+DROP TRIGGER IF EXISTS projects_record_daily_activity ON revx.projects;
+CREATE TRIGGER projects_record_daily_activity
+AFTER INSERT ON revx.projects
+FOR EACH ROW EXECUTE FUNCTION record_daily_activity('projects');
+
+DROP TRIGGER IF EXISTS reviews_record_daily_activity ON revx.reviews;
+CREATE TRIGGER reviews_record_daily_activity
+AFTER INSERT ON revx.reviews
+FOR EACH ROW EXECUTE FUNCTION record_daily_activity('reviews');
+
+-- Function : rebuild_daily_activity
+-- Recomputes the rollup for [p_from, p_to] from the raw tables. Used for the
+-- initial backfill and to repair a range after bulk imports.
+CREATE OR REPLACE FUNCTION rebuild_daily_activity(p_from date, p_to date)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    rebuilt integer;
+BEGIN
+    DELETE FROM revx.daily_activity WHERE day BETWEEN p_from AND p_to;
+
+    INSERT INTO revx.daily_activity (day, signups, projects, reviews)
+    SELECT 
+        d.day,
+        count(*) FILTER (WHERE d.kind = 'signups'),
+        count(*) FILTER (WHERE d.kind = 'projects'),
+        count(*) FILTER (WHERE d.kind = 'reviews')
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, 'signups' AS kind FROM revx.profile
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'projects' FROM revx.projects
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'reviews' FROM revx.reviews
+    ) d
+    WHERE 
+        d.day BETWEEN p_from AND p_to
+    GROUP BY 
+        d.day;
+
+    GET DIAGNOSTICS rebuilt = ROW_COUNT;
+    RETURN rebuilt;
+END;
+$$;
+
+-- Backfill : daily_activity for rows that predate the triggers
+SELECT rebuild_daily_activity('1970-01-01', (now() AT TIME ZONE 'UTC')::date);
+
+-- Function : get_activity_timeseries
+-- Signups, projects and reviews per day or week (weeks start on Monday),
+-- with empty buckets reported as zeros.
+CREATE OR REPLACE FUNCTION get_activity_timeseries(
+    p_from date,
+    p_to date,
+    p_bucket text DEFAULT 'day'
+)
+RETURNS SETOF json
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+AS $$
+DECLARE
+    step interval := CASE WHEN p_bucket = 'week' THEN interval '1 week' ELSE interval '1 day' END;
+    unit text := CASE WHEN p_bucket = 'week' THEN 'week' ELSE 'day' END;
+BEGIN
+    RETURN QUERY
+    WITH buckets AS (
+        SELECT generate_series(date_trunc(unit, p_from::timestamp), p_to::timestamp, step)::date AS bucket_start
+    ),
+    totals AS (
+        SELECT 
+            date_trunc(unit, a.day::timestamp)::date AS bucket_start,
+            sum(a.signups) AS signups,
+            sum(a.projects) AS projects,
+            sum(a.reviews) AS reviews
+        FROM 
+            revx.daily_activity a
+        WHERE 
+            a.day BETWEEN p_from AND p_to
+        GROUP BY 
+            1
+    )
+    SELECT 
+        json_build_object(
+            'bucket_start', b.bucket_start,
+            'signups', COALESCE(t.signups, 0),
+            'projects', COALESCE(t.projects, 0),
+            'reviews', COALESCE(t.reviews, 0)
+        )
+    FROM 
+        buckets b
+    LEFT JOIN 
+        totals t ON t.bucket_start = b.bucket_start
+    ORDER BY 
+        b.bucket_start;
+END;
+$$;
+
+-- Function : delete_project_cascade
+-- Removes a project and every dependent row in one transaction. Returns the
+-- per-table deleted-row counts, or NULL when the project does not exist.
+CREATE OR REPLACE FUNCTION delete_project_cascade(p_project_id bigint)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    deleted_reviews integer;
+    deleted_contributors integer;
+    deleted_images integer;
+    deleted_tags integer;
+BEGIN
+    -- Lock the project first so concurrent inserts of child rows wait for us
+    PERFORM 1 FROM revx.projects WHERE id = p_project_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    DELETE FROM revx.reviews WHERE project_id = p_project_id;
+    GET DIAGNOSTICS deleted_reviews = ROW_COUNT;
+
+    DELETE FROM revx.contributors WHERE project_id = p_project_id;
+    GET DIAGNOSTICS deleted_contributors = ROW_COUNT;
+
+    DELETE FROM revx.project_images WHERE project_id = p_project_id;
+    GET DIAGNOSTICS deleted_images = ROW_COUNT;
+
+    DELETE FROM "revx"."project_R_tag" WHERE project_id = p_project_id;
+    GET DIAGNOSTICS deleted_tags = ROW_COUNT;
+
+    DELETE FROM revx.projects WHERE id = p_project_id;
+
+    RETURN json_build_object(
+        'project_id', p_project_id,
+        'related_data_deleted', json_build_object(
+            'reviews', deleted_reviews,
+            'contributors', deleted_contributors,
+            'images', deleted_images,
+            'tags', deleted_tags
+        )
+    );
+END;
+$$;
+
+-- Function : delete_user_cascade
+-- Removes a user's whole footprint (their reviews and contributions, their
+-- projects with all dependent rows, and their profile) in one transaction.
+-- The auth.users row is left to the GoTrue admin API. Returns NULL when the
+-- profile does not exist.
+CREATE OR REPLACE FUNCTION delete_user_cascade(p_user_id uuid)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    owned_project_ids bigint[];
+    deleted_reviews integer;
+    deleted_project_reviews integer;
+    deleted_contributors integer;
+    deleted_images integer;
+    deleted_tags integer;
+BEGIN
+    PERFORM 1 FROM revx.profile WHERE id = p_user_id FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT coalesce(array_agg(id), '{}') INTO owned_project_ids
+    FROM revx.projects
+    WHERE owner_id = p_user_id;
+
+    DELETE FROM revx.reviews WHERE user_id = p_user_id;
+    GET DIAGNOSTICS deleted_reviews = ROW_COUNT;
+
+    DELETE FROM revx.reviews WHERE project_id = ANY(owned_project_ids);
+    GET DIAGNOSTICS deleted_project_reviews = ROW_COUNT;
+
+    DELETE FROM revx.contributors WHERE user_id = p_user_id OR project_id = ANY(owned_project_ids);
+    GET DIAGNOSTICS deleted_contributors = ROW_COUNT;
+
+    DELETE FROM revx.project_images WHERE project_id = ANY(owned_project_ids);
+    GET DIAGNOSTICS deleted_images = ROW_COUNT;
+
+    DELETE FROM "revx"."project_R_tag" WHERE project_id = ANY(owned_project_ids);
+    GET DIAGNOSTICS deleted_tags = ROW_COUNT;
+
+    DELETE FROM revx.projects WHERE id = ANY(owned_project_ids);
+
+    DELETE FROM revx.profile WHERE id = p_user_id;
+
+    RETURN json_build_object(
+        'user_id', p_user_id,
+        'project_ids', to_json(owned_project_ids),
+        'related_data_deleted', json_build_object(
+            'projects', cardinality(owned_project_ids),
+            'reviews', deleted_reviews + deleted_project_reviews,
+            'contributors', deleted_contributors,
+            'images', deleted_images,
+            'tags', deleted_tags
+        )
+    );
+END;
+$$;
+
+-- Function : create_project
+-- Inserts a project with its images and tag links in one transaction and
+-- returns the assembled project document. A duplicate title surfaces as the
+-- unique_violation (23505) of the projects.title constraint.
+CREATE OR REPLACE FUNCTION create_project(
+    p_title text,
+    p_description text,
+    p_owner_id uuid,
+    p_images text[] DEFAULT '{}',
+    p_tag_ids bigint[] DEFAULT '{}'
+)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    new_project_id bigint;
+BEGIN
+    INSERT INTO revx.projects (title, description, owner_id)
+    VALUES (p_title, p_description, p_owner_id)
+    RETURNING id INTO new_project_id;
+
+    -- Keep the submitted image order so ids follow it
+    INSERT INTO revx.project_images (project_id, image_link)
+    SELECT new_project_id, img.link
+    FROM unnest(COALESCE(p_images, '{}')) WITH ORDINALITY AS img(link, position)
+    ORDER BY img.position;
+
+    INSERT INTO "revx"."project_R_tag" (project_id, tag_id)
+    SELECT DISTINCT new_project_id, tag.id
+    FROM unnest(COALESCE(p_tag_ids, '{}')) AS tag(id);
+
+    RETURN get_project_with_details(new_project_id::integer);
+END;
+$$;
+
+-- Function : submit_review
+-- Adds a review in one call. The project row is share-locked so it cannot be
+-- deleted mid-insert; the stats trigger updates the rating aggregates in the
+-- same transaction. Errors: P0002 project not found, P0001 self-review,
+-- 23505 duplicate review (reviews_project_id_user_id_key), 23514 bad rating.
+CREATE OR REPLACE FUNCTION submit_review(
+    p_project_id bigint,
+    p_user_id uuid,
+    p_review text,
+    p_rating bigint
+)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY INVOKER
+AS $$
+DECLARE
+    project_owner uuid;
+    new_review revx.reviews;
+BEGIN
+    SELECT owner_id INTO project_owner
+    FROM revx.projects
+    WHERE id = p_project_id
+    FOR SHARE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Project not found' USING ERRCODE = 'no_data_found';
+    END IF;
+
+    IF project_owner = p_user_id THEN
+        RAISE EXCEPTION 'You cannot review your own project' USING ERRCODE = 'raise_exception';
+    END IF;
+
+    INSERT INTO revx.reviews (project_id, user_id, review, rating)
+    VALUES (p_project_id, p_user_id, p_review, p_rating)
+    RETURNING * INTO new_review;
+
+    RETURN row_to_json(new_review);
+END;
+$$;
@@ -62,4 +62,89 @@ CREATE TABLE revx.tags (
   id bigint GENERATED ALWAYS AS IDENTITY NOT NULL UNIQUE,
   tag_name character varying NOT NULL UNIQUE,
   CONSTRAINT tags_pkey PRIMARY KEY (id)
-);
\ No newline at end of file
+);
+-- Indexes backing the paginated catalog and per-project lookups
+CREATE INDEX projects_created_at_id_idx ON revx.projects (created_at DESC, id DESC);
+CREATE INDEX reviews_project_id_idx ON revx.reviews (project_id);
+CREATE INDEX project_images_project_id_idx ON revx.project_images (project_id);
+CREATE INDEX project_r_tag_project_id_idx ON revx."project_R_tag" (project_id);
+
+-- Full-text search over project titles (weight A) and descriptions (weight B)
+ALTER TABLE revx.projects ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+  setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+  setweight(to_tsvector('english', coalesce(description, '')), 'B')
+) STORED;
+CREATE INDEX projects_search_vector_idx ON revx.projects USING GIN (search_vector);
+CREATE INDEX project_r_tag_tag_id_idx ON revx."project_R_tag" (tag_id, project_id);
+
+-- Per-project rating aggregates, maintained by triggers on revx.reviews.
+-- project_created_at mirrors projects.created_at so the catalog sort key
+-- (avg_rating, created_at, id) can be served from a single index.
+CREATE TABLE revx.project_stats (
+  project_id bigint NOT NULL,
+  project_created_at timestamp with time zone NOT NULL,
+  review_count bigint NOT NULL DEFAULT 0,
+  rating_sum bigint NOT NULL DEFAULT 0,
+  avg_rating numeric(3,2) GENERATED ALWAYS AS (
+    CASE WHEN review_count > 0 THEN round(rating_sum::numeric / review_count, 2) ELSE 0 END
+  ) STORED,
+  star_1 bigint NOT NULL DEFAULT 0,
+  star_2 bigint NOT NULL DEFAULT 0,
+  star_3 bigint NOT NULL DEFAULT 0,
+  star_4 bigint NOT NULL DEFAULT 0,
+  star_5 bigint NOT NULL DEFAULT 0,
+  updated_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT project_stats_pkey PRIMARY KEY (project_id),
+  CONSTRAINT project_stats_project_id_fkey FOREIGN KEY (project_id) REFERENCES revx.projects(id) ON DELETE CASCADE
+);
+CREATE INDEX project_stats_catalog_idx ON revx.project_stats (avg_rating DESC, project_created_at DESC, project_id DESC);
+
+-- Backs the recent-signup counts on the admin dashboard
+CREATE INDEX profile_created_at_idx ON revx.profile (created_at);
+
+-- Daily activity rollup (UTC days): rows created per day in profile,
+-- projects and reviews. Maintained by insert triggers; deletes do not
+-- rewrite history.
+CREATE TABLE revx.daily_activity (
+  day date NOT NULL,
+  signups bigint NOT NULL DEFAULT 0,
+  projects bigint NOT NULL DEFAULT 0,
+  reviews bigint NOT NULL DEFAULT 0,
+  CONSTRAINT daily_activity_pkey PRIMARY KEY (day)
+);
+
+-- Background jobs for heavy admin operations. Workers claim queued jobs, or
+-- running jobs whose updated_at heartbeat has gone stale after a restart.
+CREATE TABLE revx.admin_jobs (
+  id uuid NOT NULL DEFAULT gen_random_uuid(),
+  kind character varying NOT NULL,
+  payload jsonb NOT NULL DEFAULT '{}'::jsonb,
+  status character varying NOT NULL DEFAULT 'queued',
+  progress jsonb NOT NULL DEFAULT '{}'::jsonb,
+  result jsonb,
+  error text,
+  attempts integer NOT NULL DEFAULT 0,
+  created_by uuid,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  updated_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT admin_jobs_pkey PRIMARY KEY (id),
+  CONSTRAINT admin_jobs_status_check CHECK (status IN ('queued', 'running', 'succeeded', 'failed'))
+);
+CREATE INDEX admin_jobs_pending_idx ON revx.admin_jobs (updated_at) WHERE status IN ('queued', 'running');
+
+-- One review per user per project, enforced by the database instead of a
+-- pre-check. Earlier duplicates are collapsed to the first review first.
+DELETE FROM revx.reviews r
+USING revx.reviews older
+WHERE older.project_id = r.project_id
+  AND older.user_id = r.user_id
+  AND older.id < r.id;
+ALTER TABLE revx.reviews
+  ADD CONSTRAINT reviews_project_id_user_id_key UNIQUE (project_id, user_id);
+-- NOT VALID: only new and re-rated reviews are checked
+ALTER TABLE revx.reviews
+  ADD CONSTRAINT reviews_rating_check CHECK (rating BETWEEN 1 AND 5) NOT VALID;
+
+-- Per-user lookups: the admin export's per-user counts, my_projects and my_reviews
+CREATE INDEX projects_owner_id_idx ON revx.projects (owner_id);
+CREATE INDEX reviews_user_id_idx ON revx.reviews (user_id);
@@ -0,0 +1,130 @@
+from database import supabase, execute, execute_raw, DB_MAX_WORKERS
+from typing import Any, Dict, List, Tuple
+from dotenv import load_dotenv
+import json
+import os
+
+load_dotenv()
+
+# Optional direct Postgres read path for the hottest read RPCs. PostgREST stays
+# the default and handles every write; set DIRECT_DB_READS=true and DATABASE_URL
+# to serve these reads over a pooled asyncpg connection instead.
+DIRECT_DB_READS = os.getenv("DIRECT_DB_READS", "false").lower() in ("1", "true", "yes")
+DATABASE_URL = os.getenv("DATABASE_URL")
+DIRECT_DB_POOL_MIN = int(os.getenv("DIRECT_DB_POOL_MIN", "1"))
+DIRECT_DB_POOL_MAX = int(os.getenv("DIRECT_DB_POOL_MAX", str(DB_MAX_WORKERS)))
+# Statements are prepared once per connection; set 0 behind a transaction-mode pooler
+DIRECT_DB_STATEMENT_CACHE = int(os.getenv("DIRECT_DB_STATEMENT_CACHE", "100"))
+
+# function -> (returns a set of rows, [(parameter, type)]) in PostgREST's naming
+_READ_FUNCTIONS: Dict[str, Tuple[bool, List[Tuple[str, str]]]] = {
+    "list_projects_page_payload": (False, [
+        ("p_limit", "integer"),
+        ("p_cursor_rating", "numeric"),
+        ("p_cursor_created_at", "timestamptz"),
+        ("p_cursor_id", "bigint"),
+        ("p_view", "text"),
+        ("p_fields", "text[]"),
+    ]),
+    "get_project_with_details": (False, [("project_id", "integer")]),
+    "get_user_projects_with_images": (True, [
+        ("user_id", "uuid"),
+        ("p_view", "text"),
+        ("p_fields", "text[]"),
+    ]),
+    "get_user_reviews": (True, [("user_id", "uuid")]),
+    "admin_export_projects": (True, [("p_after_id", "bigint"), ("p_limit", "integer")]),
+    "admin_export_reviews": (True, [("p_after_id", "bigint"), ("p_limit", "integer")]),
+    "admin_export_users": (True, [("p_after_id", "uuid"), ("p_limit", "integer")]),
+}
+
+def _call(function: str) -> str:
+    _, params = _READ_FUNCTIONS[function]
+    # Arguments travel as text and are cast server-side, so values decoded
+    # from JSON cursors need no client-side type conversion
+    args = ", ".join(
+        f"{name} => ${position}::text::{pg_type}"
+        for position, (name, pg_type) in enumerate(params, start=1)
+    )
+    return f"revx.{function}({args})"
+
+def _raw_statement(function: str) -> str:
+    """The whole result as one JSON text, shaped like PostgREST's response body"""
+    returns_set, _ = _READ_FUNCTIONS[function]
+    if returns_set:
+        return (
+            f"SELECT COALESCE(json_agg(t.value ORDER BY t.n), '[]'::json)::text "
+            f"FROM {_call(function)} WITH ORDINALITY AS t(value, n)"
+        )
+    return f"SELECT {_call(function)}::text"
+
+_STATEMENTS = {function: f"SELECT {_call(function)}" for function in _READ_FUNCTIONS}
+_RAW_STATEMENTS = {function: _raw_statement(function) for function in _READ_FUNCTIONS}
+
+_pool = None
+
+async def open_direct_pool() -> None:
+    global _pool
+    if not DIRECT_DB_READS or _pool is not None:
+        return
+    if not DATABASE_URL:
+        raise RuntimeError("DIRECT_DB_READS is enabled but DATABASE_URL is not set")
+
+    import asyncpg
+
+    _pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=DIRECT_DB_POOL_MIN,
+        max_size=DIRECT_DB_POOL_MAX,
+        statement_cache_size=DIRECT_DB_STATEMENT_CACHE,
+        server_settings={"search_path": "revx, public", "application_name": "revx-api"},
+    )
+
+async def close_direct_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+def _as_text(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        # Array literal, every element quoted so commas and braces survive
+        elements = (
+            '"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for item in value
+        )
+        return "{" + ",".join(elements) + "}"
+    return None if value is None else str(value)
+
+def _args(function: str, params: Dict[str, Any]) -> List[Any]:
+    _, signature = _READ_FUNCTIONS[function]
+    return [_as_text(params.get(name)) for name, _ in signature]
+
+async def _fetch_direct(function: str, params: Dict[str, Any]) -> Any:
+    returns_set, _ = _READ_FUNCTIONS[function]
+    args = _args(function, params)
+    async with _pool.acquire() as connection:
+        rows = await connection.fetch(_STATEMENTS[function], *args)
+
+    # Same shapes as PostgREST: a list for SETOF json, a single value otherwise
+    values = [json.loads(row[0]) for row in rows if row[0] is not None]
+    if returns_set:
+        return values
+    return values[0] if values else None
+
+async def read_rpc(function: str, params: Dict[str, Any]) -> Any:
+    """Call a read-only RPC, over the direct pool when enabled, else through PostgREST"""
+    if _pool is not None and function in _READ_FUNCTIONS:
+        return await _fetch_direct(function, params)
+
+    result = await execute(supabase.schema("revx").rpc(function, params))
+    return result.data
+
+async def read_rpc_raw(function: str, params: Dict[str, Any]) -> bytes:
+    """Like read_rpc, but return the JSON Postgres built as bytes, never decoded here"""
+    if _pool is not None and function in _READ_FUNCTIONS:
+        async with _pool.acquire() as connection:
+            text = await connection.fetchval(_RAW_STATEMENTS[function], *_args(function, params))
+        return b"null" if text is None else text.encode("utf-8")
+
+    return await execute_raw(supabase.schema("revx").rpc(function, params))
@@ -1,12 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import auth, project, user, admin, imagekit
+from fastapi.responses import ORJSONResponse
+from routers import auth, project, user, admin, imagekit, suggest
+from services.suggest_service import build_suggest_indexes
+from direct_db import open_direct_pool, close_direct_pool
+from services.job_service import start_job_workers, stop_job_workers
+from services.tag_service import load_tag_catalog, start_tag_refresh, stop_tag_refresh
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="RevX API")
+app = FastAPI(title="RevX API", default_response_class=ORJSONResponse)
 
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
 origins = [
@@ -21,6 +26,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Content-Disposition"],
 )
 
 app.include_router(auth.router, prefix='/auth', tags=['Authentication'])
@@ -28,6 +34,42 @@ app.include_router(project.router, prefix='/project', tags=['Project'])
 app.include_router(user.router, prefix='/user', tags=['User'])
 app.include_router(imagekit.router, prefix='/api/imagekit', tags=['ImageKit'])
 app.include_router(admin.router, prefix='/admin', tags=['Admin'])
+app.include_router(suggest.router, prefix='/suggest', tags=['Suggest'])
+
+
+@app.on_event("startup")
+async def startup():
+    try:
+        await open_direct_pool()
+    except Exception as e:
+        # Reads keep going through PostgREST
+        print(f"Error opening direct database pool: {str(e)}")
+
+    try:
+        await build_suggest_indexes()
+    except Exception as e:
+        # Suggestions stay empty until the next restart; the API still serves
+        print(f"Error building suggestion indexes: {str(e)}")
+
+    try:
+        await load_tag_catalog()
+    except Exception as e:
+        # Loaded on first use instead, and retried by the refresh timer
+        print(f"Error loading tag catalog: {str(e)}")
+    start_tag_refresh()
+
+    try:
+        await start_job_workers()
+    except Exception as e:
+        # Queued jobs are picked up by the next sweep or restart
+        print(f"Error resuming background jobs: {str(e)}")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await stop_tag_refresh()
+    await stop_job_workers()
+    await close_direct_pool()
 
 
 @app.get("/")
@@ -1,15 +1,119 @@
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from database import supabase
+from gotrue.types import User, UserResponse
+from database import supabase, run_sync
+from services.profile_service import get_profile
+from utils.cache import TTLCache
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+import hashlib
+import time
+import jwt
+import os
+
+load_dotenv()
 
 security = HTTPBearer()
 
+# Local verification uses the project's HS256 secret when set, otherwise the
+# JWKS published by GoTrue. With neither configured we fall back to GoTrue.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL")
+JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+JWT_LEEWAY = int(os.getenv("SUPABASE_JWT_LEEWAY", "10"))
+
+_jwks_client = jwt.PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True, lifespan=3600) if SUPABASE_JWKS_URL else None
+
+# Verified tokens, keyed by token digest; entries never outlive the token's exp
+_verified_tokens = TTLCache(maxsize=int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024")), ttl=300)
+
+# Revoked sessions (or token digests), kept until the token would have expired.
+# Unbounded on purpose: evicting an entry early would make its token valid again.
+# Its size is bounded by the logouts within one token lifetime.
+_revoked_tokens = TTLCache(maxsize=None, ttl=3600)
+_REVOCATION_PURGE_INTERVAL = 60
+_last_revocation_purge = time.monotonic()
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _revocation_key(claims: dict, digest: str) -> str:
+    return claims.get("session_id") or claims.get("jti") or digest
+
+def _decode_token(token: str) -> dict:
+    options = {"require": ["exp", "sub"]}
+    if SUPABASE_JWT_SECRET:
+        return jwt.decode(
+            token, SUPABASE_JWT_SECRET, algorithms=["HS256"],
+            audience=JWT_AUDIENCE, leeway=JWT_LEEWAY, options=options,
+        )
+
+    signing_key = _jwks_client.get_signing_key_from_jwt(token)
+    return jwt.decode(
+        token, signing_key.key, algorithms=["RS256", "ES256"],
+        audience=JWT_AUDIENCE, leeway=JWT_LEEWAY, options=options,
+    )
+
+def _user_from_claims(claims: dict) -> UserResponse:
+    """Build the same shape supabase.auth.get_user returns from JWT claims"""
+    issued_at = datetime.fromtimestamp(claims.get("iat", claims["exp"]), tz=timezone.utc)
+    return UserResponse(user=User(
+        id=claims["sub"],
+        aud=claims.get("aud") if isinstance(claims.get("aud"), str) else JWT_AUDIENCE,
+        email=claims.get("email"),
+        phone=claims.get("phone"),
+        role=claims.get("role"),
+        app_metadata=claims.get("app_metadata") or {},
+        user_metadata=claims.get("user_metadata") or {},
+        is_anonymous=claims.get("is_anonymous", False),
+        created_at=issued_at,
+    ))
+
+def revoke_token(token: str) -> None:
+    """Reject this token (and its session) until it expires"""
+    global _last_revocation_purge
+    digest = _token_digest(token)
+    try:
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.PyJWTError:
+        claims = {}
+
+    remaining = max(claims.get("exp", 0) - time.time(), 0) + JWT_LEEWAY
+    _revoked_tokens.set(_revocation_key(claims, digest), True, ttl=remaining)
+    _verified_tokens.pop(digest)
+
+    # Expired entries are otherwise only dropped when looked up again
+    if time.monotonic() - _last_revocation_purge > _REVOCATION_PURGE_INTERVAL:
+        _last_revocation_purge = time.monotonic()
+        _revoked_tokens.purge_expired()
+
 async def verify_token(
         credentials: HTTPAuthorizationCredentials = Depends(security)
     ):
     token = credentials.credentials
+    digest = _token_digest(token)
     try:
-        user = supabase.auth.get_user(token)
+        cached = _verified_tokens.get(digest)
+        if cached is not None:
+            revocation_key, user = cached
+        else:
+            if SUPABASE_JWT_SECRET or _jwks_client:
+                # JWKS keys are cached by PyJWKClient; a miss means a network fetch
+                claims = _decode_token(token) if SUPABASE_JWT_SECRET else await run_sync(_decode_token, token)
+                user = _user_from_claims(claims)
+            else:
+                user = await run_sync(supabase.auth.get_user, token)
+                if not user or not user.user:
+                    raise ValueError("Invalid token")
+                claims = jwt.decode(token, options={"verify_signature": False})
+
+            revocation_key = _revocation_key(claims, digest)
+            remaining = claims.get("exp", 0) - time.time()
+            if remaining > 0:
+                _verified_tokens.set(digest, (revocation_key, user), ttl=min(remaining, _verified_tokens.ttl))
+
+        if _revoked_tokens.get(revocation_key):
+            raise ValueError("Token has been revoked")
         return user
     except Exception as e:
         raise HTTPException(
@@ -17,16 +121,16 @@ async def verify_token(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
 async def get_current_user(user = Depends(verify_token)):
     return user
 
 async def get_admin_user(user = Depends(get_current_user)):
     try:
         user_id = str(user.user.id)
-        profile = supabase.schema("revx").table("profile").select("is_admin").eq("id", user_id).single().execute()
-        
-        if not profile.data or not profile.data.get("is_admin"):
+        profile = await get_profile(user_id)
+
+        if not profile or not profile.get("is_admin"):
             raise HTTPException(
                 status_code=403,
                 detail="Admin access required",
@@ -40,4 +144,4 @@ async def get_admin_user(user = Depends(get_current_user)):
             status_code=500,
             detail=f"Error verifying admin status: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from database import supabase
+from fastapi import APIRouter, HTTPException, Depends, Query, Path, Request
+from fastapi.responses import StreamingResponse
+from database import supabase, execute, http_pool_stats
 from models.user import AdminUserUpdate, DashboardMetrics
 from services.admin_service import (
     get_dashboard_metrics, 
+    get_activity_timeseries,
     get_all_users, 
     get_all_projects, 
     toggle_user_admin_status,
-    delete_user
+    delete_user,
+    open_export,
+    EXPORTS
 )
 from middleware.auth_middleware import get_admin_user
+from services.profile_service import profile_cache_stats
+from services.job_service import get_job
+from services.tag_service import load_tag_catalog
+from utils.response_cache import response_cache, project_tag, CATALOG_TAG, PROFILES_TAG
+from utils.export_stream import ndjson_stream, csv_stream, gzip_stream, accepts_gzip
 from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta, timezone
 
 router = APIRouter()
 
@@ -24,6 +34,68 @@ async def dashboard_metrics(user = Depends(get_admin_user)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting metrics: {str(e)}")
 
+@router.get("/metrics/timeseries", status_code=200)
+async def metrics_timeseries(
+    user = Depends(get_admin_user),
+    from_: Optional[date] = Query(None, alias="from"),
+    to: Optional[date] = Query(None),
+    bucket: str = Query("day", pattern="^(day|week)$")
+):
+    """Get daily or weekly activity counts for a date range (default: last 30 days)"""
+    try:
+        # daily_activity is bucketed by UTC day
+        end = to or datetime.now(timezone.utc).date()
+        start = from_ or end - timedelta(days=29)
+        if start > end:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        if (end - start).days > 3660:
+            raise HTTPException(status_code=400, detail="Date range is limited to 10 years")
+
+        series = await get_activity_timeseries(start, end, bucket)
+        return {
+            "status": "success",
+            "bucket": bucket,
+            "from": start,
+            "to": end,
+            "data": series
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting activity timeseries: {str(e)}")
+
+@router.get("/cache/stats", status_code=200)
+async def cache_stats(user = Depends(get_admin_user)):
+    """Get hit/miss counters for the in-process caches"""
+    return {
+        "status": "success",
+        "data": {
+            "profiles": profile_cache_stats(),
+            "responses": response_cache.stats()
+        }
+    }
+
+@router.get("/http/stats", status_code=200)
+async def http_stats(user = Depends(get_admin_user)):
+    """Get utilization of the shared Supabase HTTP connection pool"""
+    return {
+        "status": "success",
+        "data": http_pool_stats()
+    }
+
+@router.post("/tags/reload", status_code=200)
+async def reload_tags(user = Depends(get_admin_user)):
+    """Reload the in-process tag catalog after tags were edited in the database"""
+    try:
+        catalog = await load_tag_catalog()
+        return {
+            "status": "success",
+            "message": "Tag catalog reloaded",
+            "count": len(catalog.by_id)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reloading tags: {str(e)}")
+
 @router.get("/users", status_code=200)
 async def list_users(
     user = Depends(get_admin_user),
@@ -62,6 +134,37 @@ async def list_projects(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
 
+@router.get("/export/{kind}", status_code=200)
+async def export_data(
+    request: Request,
+    kind: str = Path(..., pattern="^(projects|reviews|users)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    user = Depends(get_admin_user)
+):
+    """Stream every project, review or user as NDJSON or CSV, gzipped when accepted.
+
+    If a page after the first fails, the connection is dropped mid-stream, so
+    the download fails instead of ending early.
+    """
+    pages = await open_export(kind)
+    if format == "csv":
+        body = csv_stream(pages, EXPORTS[kind][1])
+        media_type = "text/csv; charset=utf-8"
+    else:
+        body = ndjson_stream(pages)
+        media_type = "application/x-ndjson"
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="revx-{kind}-{date.today().isoformat()}.{format}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(request.headers.get("accept-encoding")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(body, media_type=media_type, headers=headers)
+
 @router.put("/users/{user_id}/admin", status_code=200)
 async def update_user_admin_status(
     user_id: str,
@@ -81,24 +184,44 @@ async def update_user_admin_status(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating user admin status: {str(e)}")
 
-@router.delete("/users/{user_id}", status_code=200)
+@router.delete("/users/{user_id}", status_code=202)
 async def admin_delete_user(
     user_id: str,
     user = Depends(get_admin_user)
 ):
-    """Delete a user and all their associated data"""
+    """Queue deletion of a user and all their associated data; poll /admin/jobs/{job_id} for progress"""
     try:
-        result = await delete_user(user_id)
+        job = await delete_user(user_id, requested_by=str(user.user.id))
         return {
-            "status": "success",
-            "message": "User deleted successfully",
-            "data": result
+            "status": "accepted",
+            "message": "User deletion queued",
+            "job_id": job["id"],
+            "data": job
         }
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
 
+@router.get("/jobs/{job_id}", status_code=200)
+async def job_status(
+    job_id: str,
+    user = Depends(get_admin_user)
+):
+    """Get the status and progress of a background admin job"""
+    try:
+        job = await get_job(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {
+            "status": "success",
+            "data": job
+        }
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching job: {str(e)}")
+
 @router.delete("/projects/{project_id}", status_code=200)
 async def admin_delete_project(
     project_id: str,
@@ -108,15 +231,11 @@ async def admin_delete_project(
     try:
         from services.project_service import delete_project_service
         
-        # Check if project exists
-        project_check = supabase.schema("revx").table("projects").select("*").eq("id", project_id).execute()
-        if not project_check.data:
-            raise HTTPException(status_code=404, detail="Project not found")
-            
-        # Delete project
+        # Delete project; the cascade procedure reports 404 for unknown ids
         res = await delete_project_service(project_id)
         if not res:
             raise HTTPException(status_code=500, detail="Failed to delete project")
+        response_cache.invalidate(CATALOG_TAG, project_tag(project_id))
 
         return {
             "status": "success",
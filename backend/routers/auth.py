@@ -1,8 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends
-from database import supabase
+from database import supabase, run_sync, run_auth
 from models.user import UserCreate, UserLogin, PasswordChangeRequest, ForgotPasswordRequest
 from services.auth_service import create_user_profile, change_password_service
-from middleware.auth_middleware import get_current_user
+from services.profile_service import get_profile, get_profile_by_username
+from middleware.auth_middleware import get_current_user, revoke_token, security
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import EmailStr
 import os
 
@@ -20,14 +22,13 @@ async def register_user(user: UserCreate):
         if not user.full_name:
             raise HTTPException(status_code=400, detail="Full name is required")
         
-        username_exist_check = supabase.schema("revx").table("profile").select("username").eq("username", user.username).execute()
-        if username_exist_check.data:
+        if await get_profile_by_username(user.username):
             raise HTTPException(status_code=400, detail="User with this username already exists")
 
-        auth_res = supabase.auth.sign_up({
+        auth_res = await run_auth(lambda auth: auth.sign_up({
             "email": user.email,
             "password": user.password
-        })
+        }))
 
         if auth_res.user is None:
             raise HTTPException(status_code=400, detail="Registration failed")
@@ -50,7 +51,7 @@ async def register_user(user: UserCreate):
                 "auth_token": auth_res.session.access_token,
             }
         except Exception as profile_err:
-            supabase.auth.admin.delete_user(auth_res.user.id)
+            await run_sync(supabase.auth.admin.delete_user, auth_res.user.id)
             raise HTTPException(
                 status_code=400,
                 detail=f"Error creating user profile: {str(profile_err)}"
@@ -68,25 +69,25 @@ async def login_user(user: UserLogin):
         if not user.password:
             raise HTTPException(status_code=400, detail="Password is required")
 
-        auth_res = supabase.auth.sign_in_with_password({
+        auth_res = await run_auth(lambda auth: auth.sign_in_with_password({
             "email": user.email,
             "password": user.password
-        })
+        }))
 
         if auth_res.user is None:
             raise HTTPException(status_code=400, detail="Invalid email or password")
         
         try:
-            profile = supabase.schema("revx").table("profile").select("*").eq("id", auth_res.user.id).single().execute()
+            profile = await get_profile(auth_res.user.id)
 
-            if not profile.data:
+            if not profile:
                 raise HTTPException(
                     status_code=400,
                     detail="Profile not found for the user"
                 )
             
             profile_data = {
-                **profile.data,
+                **profile,
                 "email": auth_res.user.email,
             }
 
@@ -107,9 +108,19 @@ async def login_user(user: UserLogin):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/logout", status_code=200)
-async def logout_user(current_user = Depends(get_current_user)):
+async def logout_user(
+    current_user = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     try:
-        auth_res = supabase.auth.sign_out()
+        # End only this session, identified by its own token
+        try:
+            await run_sync(supabase.auth.admin.sign_out, credentials.credentials, "local")
+        except Exception as e:
+            # The session may already be gone server-side; still revoke below
+            print(f"Error ending auth session: {str(e)}")
+        # Locally verified tokens stay valid until exp unless revoked here
+        revoke_token(credentials.credentials)
 
         return {
             "status": "success",
@@ -128,7 +139,7 @@ async def change_password(
 ):
     try:
         success = await change_password_service(
-            user_id=user.user.id,
+            user_id=str(user.user.id),
             email=user.user.email,
             current_password=password_data.current_password,
             new_password=password_data.new_password
@@ -149,7 +160,8 @@ async def forgot_password(request: ForgotPasswordRequest):
         if not request.email:
             raise HTTPException(status_code=400, detail="Email is required")
 
-        auth_res = supabase.auth.reset_password_for_email(
+        auth_res = await run_sync(
+            supabase.auth.reset_password_for_email,
             request.email,
             options = {
                 "redirect_to": os.getenv("RESET_PASSWORD_URL", "http://localhost:5173/resetpassword"), 
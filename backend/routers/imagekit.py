@@ -3,33 +3,33 @@ import time
 import hashlib
 import hmac
 import os
-from fastapi import APIRouter
+from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
+from middleware.auth_middleware import get_current_user
+from dotenv import load_dotenv
 
-router = APIRouter()
+load_dotenv()
 
-@router.get("/auth")
-async def get_auth_params():
-    private_key = os.getenv("IMAGEKIT_PRIVATE_KEY")
-    if not private_key:
-        return JSONResponse(
-            status_code=500,
-            content={"error": "ImageKit private key not configured"}
-        )
+# Read once at startup; the key never changes while the process runs
+IMAGEKIT_PRIVATE_KEY = os.getenv("IMAGEKIT_PRIVATE_KEY")
+# Most signatures one request returns; larger counts are clamped, not rejected
+IMAGEKIT_AUTH_MAX_COUNT = int(os.getenv("IMAGEKIT_AUTH_MAX_COUNT", "20"))
+# Signed upload tokens are valid for 30 minutes
+IMAGEKIT_AUTH_EXPIRY = 30 * 60
 
-    # 1. Generate a random token with UUID
-    token = str(uuid.uuid4())  # Instead of int(time.time() * 1000)
+_private_key = IMAGEKIT_PRIVATE_KEY.encode("utf-8") if IMAGEKIT_PRIVATE_KEY else None
 
-    # 2. Calculate an expiry time in seconds (e.g. 30 mins from now)
-    expire = int(time.time()) + (30 * 60)
+router = APIRouter()
 
-    # 3. Create the string to sign: token + expire
-    string_to_sign = token + str(expire)
+def _sign_upload(expire: int) -> Dict[str, Any]:
+    # 1. Generate a random token with UUID
+    token = str(uuid.uuid4())
 
-    # 4. Hash the string with your private key
+    # 2. Sign token + expire with the private key
     signature = hmac.new(
-        bytes(private_key, 'utf-8'),
-        bytes(string_to_sign, 'utf-8'),
+        _private_key,
+        (token + str(expire)).encode("utf-8"),
         hashlib.sha1
     ).hexdigest()
 
@@ -37,4 +37,28 @@ async def get_auth_params():
         "token": token,
         "signature": signature,
         "expire": expire
-    }
\ No newline at end of file
+    }
+
+@router.get("/auth")
+async def get_auth_params(
+    count: Optional[int] = Query(None, ge=1, description="Number of upload signatures"),
+    user = Depends(get_current_user)
+):
+    if not _private_key:
+        return JSONResponse(
+            status_code=500,
+            content={"error": "ImageKit private key not configured"}
+        )
+
+    expire = int(time.time()) + IMAGEKIT_AUTH_EXPIRY
+
+    # Without count, a single signature as before
+    if count is None:
+        return _sign_upload(expire)
+
+    # Every upload needs its own token: ImageKit rejects a token used twice.
+    # Clients asking for more than the limit get max_count and ask again.
+    return {
+        "tokens": [_sign_upload(expire) for _ in range(min(count, IMAGEKIT_AUTH_MAX_COUNT))],
+        "max_count": IMAGEKIT_AUTH_MAX_COUNT
+    }
@@ -1,13 +1,36 @@
-from fastapi import APIRouter, HTTPException, Depends
-from database import supabase
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Optional
+from database import supabase, execute
 from models.project import ProjectCreate, ContributorCreate, ReviewCreate, ProjectUpdate
 from middleware.auth_middleware import get_current_user
+from services.profile_service import get_profile_by_username
+from services.suggest_service import index_project
+from utils.response_cache import response_cache, project_tag, CATALOG_TAG, PROFILES_TAG
+from utils.http_cache import (
+    render_raw_data,
+    render_raw_members,
+    conditional_json,
+    PUBLIC_LIST_CACHE_CONTROL,
+    PUBLIC_REVALIDATE_CACHE_CONTROL,
+    PUBLIC_STATIC_CACHE_CONTROL
+)
+from utils.projection import (
+    parse_fields,
+    PROJECT_VIEW_PATTERN,
+    PROJECT_LIST_FIELDS,
+    PROJECT_SEARCH_FIELDS
+)
+from services.tag_service import get_tag_catalog, validate_tag_ids
 from services.project_service import (
     create_project_service, 
     add_contributor_service, 
     add_review_service, 
     get_project_with_details, 
-    list_projects_service,
+    get_project_payload,
+    list_projects_payload,
+    search_projects_service,
+    sync_project_images,
+    sync_project_tags,
     delete_project_service
 )
 
@@ -24,10 +47,6 @@ async def create_project(
         if not project.title:
             raise HTTPException(status_code=400, detail="Project title is required")
 
-        exist_check = supabase.schema("revx").table("projects").select("*").eq("title", project.title).execute()
-        if exist_check.data:
-            raise HTTPException(status_code=400, detail="Project with this title already exists")
-        
         project_data = await create_project_service(
             project.title,
             project.description,
@@ -35,6 +54,7 @@ async def create_project(
             project.images,
             project.tags
         )
+        response_cache.invalidate(CATALOG_TAG)
 
         return {
             "status": "success",
@@ -59,80 +79,60 @@ async def update_project(
             raise HTTPException(status_code=400, detail="Project ID is required")
 
         # Check if project exists and user is the owner
-        project_check = supabase.schema("revx").table("projects").select("*").eq("id", project_id).execute()
+        project_check = await execute(supabase.schema("revx").table("projects").select("*").eq("id", project_id))
         if not project_check.data:
             raise HTTPException(status_code=404, detail="Project not found")
             
         if project_check.data[0]["owner_id"] != user_id:
             raise HTTPException(status_code=403, detail="You are not the owner of this project")
         
-        # Create an updates dictionary with only provided fields
+        # Reject unknown tags before anything is written
+        if project.tags is not None:
+            tag_ids = await validate_tag_ids(project.tags)
+
+        # Only write fields whose value actually changes
+        current = project_check.data[0]
         updates = {}
         
-        if project.title is not None:
+        if project.title is not None and project.title != current["title"]:
             # Check if the new title already exists (but exclude this project)
-            title_check = supabase.schema("revx").table("projects").select("id").eq("title", project.title).execute()
+            title_check = await execute(supabase.schema("revx").table("projects").select("id").eq("title", project.title))
             if title_check.data and str(title_check.data[0]["id"]) != project_id:
                 raise HTTPException(status_code=400, detail="Project with this title already exists")
             updates["title"] = project.title
             
-        if project.description is not None:
+        if project.description is not None and project.description != current["description"]:
             updates["description"] = project.description
 
-        # Only update if there are changes
         if updates:
-            update_result = supabase.schema("revx").table("projects").update(updates).eq("id", project_id).execute()
+            update_result = await execute(supabase.schema("revx").table("projects").update(updates).eq("id", project_id))
             if not update_result.data:
                 raise HTTPException(status_code=500, detail="Failed to update project")
+            if "title" in updates:
+                index_project(project_id, updates["title"])
+
+        changes = {"fields": list(updates)}
 
-        # Handle image updates if provided
+        # Images and tags are diffed against the stored rows, so unchanged
+        # entries keep their rows and a no-op edit writes nothing
         if project.images is not None:
-            # First, delete existing images
-            supabase.schema("revx").table("project_images").delete().eq("project_id", project_id).execute()
-            
-            # Then add new images if there are any
-            if project.images:
-                image_data_list = []
-                for image in project.images:
-                    image_data_list.append({
-                        "project_id": project_id,
-                        "image_link": image,
-                    })
-                
-                if image_data_list:
-                    image_result = supabase.schema("revx").table("project_images").insert(image_data_list).execute()
-                    if not image_result.data:
-                        raise HTTPException(status_code=500, detail="Failed to update project images")
-
-        # Handle tag updates if provided
+            changes["images"] = await sync_project_images(project_id, project.images)
+
         if project.tags is not None:
-            supabase.schema("revx").table("project_R_tag").delete().eq("project_id", project_id).execute()
-            
-            if project.tags:
-                tag_data_list = []
-                for tag in project.tags:
-                    try:
-                        # Convert tag to integer to ensure correct type
-                        tag_id = int(tag)
-                        tag_data_list.append({
-                            "project_id": project_id,
-                            "tag_id": tag_id,
-                        })
-                    except (ValueError, TypeError):
-                        # Log or handle invalid tag IDs
-                        continue
-                
-                if tag_data_list:
-                    tag_result = supabase.schema("revx").table("project_R_tag").insert(tag_data_list).execute()
-                    if not tag_result.data:
-                        raise HTTPException(status_code=500, detail="Failed to update project tags")
-
-        # Get updated project data - moved outside conditionals to always return updated data
+            changes["tags"] = await sync_project_tags(project_id, tag_ids)
+
+        changed = bool(updates) or any(
+            diff["added"] or diff["removed"]
+            for key, diff in changes.items() if key != "fields"
+        )
+        if changed:
+            response_cache.invalidate(CATALOG_TAG, project_tag(project_id))
         project_data = await get_project_with_details(project_id)
 
         return {
             "status": "success",
-            "message": "Project updated successfully",
+            "message": "Project updated successfully" if changed else "No changes to apply",
+            "changes": changes,
             "data": project_data
         }
     except HTTPException as e:
@@ -141,28 +141,80 @@ async def update_project(
         raise HTTPException(status_code=500, detail=f"Error updating project: {str(e)}")
 
 @router.get("/list", status_code=200)
-async def list_projects():
+async def list_projects(
+    request: Request,
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: str = Query("full", pattern=PROJECT_VIEW_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma-separated project keys to return")
+):
+    async def load_page():
+        # The page arrives as finished JSON and is spliced into the envelope as is
+        return render_raw_members(await list_projects_payload(limit, cursor, view, field_list))
+
     try:
-        projects = await list_projects_service()
+        field_list = parse_fields(fields, PROJECT_LIST_FIELDS, view)
+
+        # Cached bodies carry their ETag, so a matching If-None-Match costs no DB call
+        rendered = await response_cache.get_or_load(
+            "project.list",
+            (limit, cursor, view, tuple(field_list) if field_list else None),
+            (CATALOG_TAG, PROFILES_TAG),
+            load_page
+        )
+        return conditional_json(request, rendered, PUBLIC_LIST_CACHE_CONTROL)
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error fetching projects: {str(e)}")
+
+@router.get("/search", status_code=200)
+async def search_projects(
+    q: Optional[str] = None,
+    tags: Optional[str] = Query(None, description="Comma-separated tag ids"),
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    view: str = Query("full", pattern=PROJECT_VIEW_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma-separated project keys to return")
+):
+    try:
+        # rank and id make up the next cursor, so they are always returned
+        field_list = parse_fields(fields, PROJECT_SEARCH_FIELDS, view, required=("rank", "id"))
+
+        tag_ids = None
+        if tags:
+            try:
+                tag_ids = [int(tag) for tag in tags.split(",") if tag.strip()]
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Tags must be comma-separated tag ids")
+
+        page = await search_projects_service(q, tag_ids, limit, cursor, view, field_list)
         return {
             "status": "success",
-            "data": projects
+            "data": page["data"],
+            "next_cursor": page["next_cursor"]
         }
+    except HTTPException as e:
+        raise e
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error fetching projects: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error searching projects: {str(e)}")
 
 @router.get("/get/{project_id}", status_code=200)
-async def get_project(project_id: str):
+async def get_project(project_id: str, request: Request):
+    async def load_project():
+        return render_raw_data(await get_project_payload(project_id))
+
     try:
         if not project_id:
             raise HTTPException(status_code=400, detail="Project ID is required")
         
-        project_data = await get_project_with_details(project_id)
-        
-        return {
-            "status": "success",
-            "data": project_data
-        }
+        rendered = await response_cache.get_or_load(
+            "project.get",
+            project_id,
+            (project_tag(project_id), PROFILES_TAG),
+            load_project
+        )
+        return conditional_json(request, rendered, PUBLIC_REVALIDATE_CACHE_CONTROL)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -180,25 +232,25 @@ async def add_contributor(
         if not project_id:
             raise HTTPException(status_code=400, detail="Project ID is required")
         
-        contributor_check = supabase.schema("revx").table("profile").select("*").eq("username", contributor.username).execute()
+        contributor_profile = await get_profile_by_username(contributor.username)
 
-        if not contributor_check.data:
+        if not contributor_profile:
             raise HTTPException(status_code=400, detail="User not found")
-        if contributor_check.data[0]["id"] == author.user.id:
+        if contributor_profile["id"] == author.user.id:
             raise HTTPException(status_code=400, detail="You cannot add yourself as a contributor")
 
-        author_check = supabase.schema("revx").table("projects").select("owner_id").eq("id", project_id).execute()
+        author_check = await execute(supabase.schema("revx").table("projects").select("owner_id").eq("id", project_id))
         if author_check.data[0]["owner_id"] != author.user.id:
             raise HTTPException(status_code=400, detail="You are not the owner of this project")
         
-        exists_check = supabase.schema("revx").table("contributors").select("*")\
+        exists_check = await execute(supabase.schema("revx").table("contributors").select("*")\
             .eq("project_id", project_id)\
-            .eq("user_id", contributor_check.data[0]["id"])\
-            .execute()
+            .eq("user_id", contributor_profile["id"]))
         if exists_check.data:
             raise HTTPException(status_code=400, detail="Contributor already exists")
         
-        contributor_data = await add_contributor_service(project_id, contributor_check.data[0]["id"])
+        contributor_data = await add_contributor_service(project_id, contributor_profile["id"])
+        response_cache.invalidate(project_tag(project_id))
         return {
             "status": "success",
             "message": "Contributor added successfully",
@@ -221,11 +273,12 @@ async def remove_contributor(
         if not contributor_id:
             raise HTTPException(status_code=400, detail="Contributor ID is required")
         
-        author_check = supabase.schema("revx").table("projects").select("owner_id").eq("id", project_id).execute()
+        author_check = await execute(supabase.schema("revx").table("projects").select("owner_id").eq("id", project_id))
         if author_check.data[0]["owner_id"] != user.user.id:
             raise HTTPException(status_code=400, detail="You are not the owner of this project")
         
-        delete_data = supabase.schema("revx").table("contributors").delete().eq("project_id", project_id).eq("id", contributor_id).execute()
+        delete_data = await execute(supabase.schema("revx").table("contributors").delete().eq("project_id", project_id).eq("id", contributor_id))
+        response_cache.invalidate(project_tag(project_id))
 
         return {
             "status": "success",
@@ -252,23 +305,13 @@ async def add_review(
         if not Review.review:
             raise HTTPException(status_code=400, detail="Review is required")
 
-        project_author = supabase.schema("revx").table("projects").select("owner_id").eq("id", project_id).execute()
-        if project_author.data[0]["owner_id"] == user.user.id:
-            raise HTTPException(status_code=400, detail="You cannot review your own project")
-        
-        exists_check = supabase.schema("revx").table("reviews").select("*")\
-            .eq("project_id", project_id)\
-            .eq("user_id", user.user.id)\
-            .execute()
-        if exists_check.data:
-            raise HTTPException(status_code=400, detail="User can only review a project once")
-        
         review_data = await add_review_service(
             project_id,
-            user.user.id,
+            str(user.user.id),
             Review.review,
             Review.rating
         )
+        response_cache.invalidate(CATALOG_TAG, project_tag(project_id))
 
         return {
             "status": "success",
@@ -290,7 +333,7 @@ async def remove_review(
             raise HTTPException(status_code=400, detail="Review ID is required")
         
         # Check if review exists
-        review_check = supabase.schema("revx").table("reviews").select("*").eq("id", review_id).execute()
+        review_check = await execute(supabase.schema("revx").table("reviews").select("*").eq("id", review_id))
         if not review_check.data:
             raise HTTPException(status_code=404, detail="Review not found")
             
@@ -299,7 +342,8 @@ async def remove_review(
             raise HTTPException(status_code=403, detail="You can only delete your own reviews")
         
         # Delete the review
-        delete_data = supabase.schema("revx").table("reviews").delete().eq("id", review_id).execute()
+        delete_data = await execute(supabase.schema("revx").table("reviews").delete().eq("id", review_id))
+        response_cache.invalidate(CATALOG_TAG, project_tag(review_check.data[0]["project_id"]))
 
         return {
             "status": "success",
@@ -312,29 +356,11 @@ async def remove_review(
         raise HTTPException(status_code=400, detail=f"Error removing review: {str(e)}")
     
 @router.get("/tags", status_code=200)
-async def get_tags():
+async def get_tags(request: Request):
     try:
-        tags_result = supabase.schema("revx").table("tags").select("*").execute()
-        
-        if not tags_result.data:
-            return {
-                "status": "success",
-                "data": []
-            }
-        
-        # Transform to use tag_id for consistency with other endpoints
-        transformed_tags = [
-            {
-                "tag_id": tag["id"],
-                "tag_name": tag["tag_name"]
-            }
-            for tag in tags_result.data
-        ]
-        
-        return {
-            "status": "success",
-            "data": transformed_tags
-        }
+        # Served from the warm tag catalog; the ETag changes whenever it reloads
+        catalog = await get_tag_catalog()
+        return conditional_json(request, catalog.rendered, PUBLIC_STATIC_CACHE_CONTROL)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error fetching tags: {str(e)}")
     
@@ -348,7 +374,7 @@ async def delete_project(
             raise HTTPException(status_code=400, detail="Project ID is required")
         
         # Check if project exists
-        project_check = supabase.schema("revx").table("projects").select("*").eq("id", project_id).execute()
+        project_check = await execute(supabase.schema("revx").table("projects").select("*").eq("id", project_id))
         if not project_check.data:
             raise HTTPException(status_code=404, detail="Project not found")
             
@@ -359,6 +385,7 @@ async def delete_project(
         res = await delete_project_service(project_id)
         if not res:
             raise HTTPException(status_code=500, detail="Failed to delete project")
+        response_cache.invalidate(CATALOG_TAG, project_tag(project_id))
 
         return res
     except HTTPException as e:
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Query
+from services.suggest_service import suggest
+
+router = APIRouter()
+
+@router.get("", status_code=200)
+async def get_suggestions(
+    prefix: str = Query(..., min_length=1, max_length=100),
+    kind: str = Query("project", pattern="^(project|user|tag)$"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Typeahead suggestions for project titles, usernames or tag names"""
+    try:
+        return {
+            "status": "success",
+            "data": suggest(prefix, kind, limit)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error fetching suggestions: {str(e)}")
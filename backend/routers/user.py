@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
-from middleware.auth_middleware import get_current_user
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Optional
+from fastapi.security import HTTPAuthorizationCredentials
+from middleware.auth_middleware import get_current_user, security
 from models.user import UserProfileUpdate
 from services.user_service import update_user_service
-from database import supabase
-import json
+from database import supabase, execute
+from direct_db import read_rpc_raw
+from utils.response_cache import response_cache, PROFILES_TAG
+from utils.http_cache import render_raw_data, conditional_json, PRIVATE_REVALIDATE_CACHE_CONTROL
+from utils.projection import parse_fields, PROJECT_VIEW_PATTERN, USER_PROJECT_FIELDS
 
 router = APIRouter()
 
@@ -11,6 +16,7 @@ router = APIRouter()
 async def update_user(
     user: UserProfileUpdate,
     current_user = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     try:
         user_id = str(current_user.user.id)
@@ -18,13 +24,20 @@ async def update_user(
         update_data = await update_user_service(
             user_id=user_id,
             current_email=current_user.user.email,
+            current_user=current_user.user,
+            access_token=credentials.credentials,
             **user_data
         )
 
         if not update_data:
             raise HTTPException(status_code=404, detail="User not found")
+        # Owner and reviewer details are embedded in cached project responses
+        response_cache.invalidate(PROFILES_TAG)
         
-        return {"message": "User updated successfully", "data": update_data}
+        message = "User updated successfully"
+        if update_data.get("pending_email"):
+            message += "; confirm the new email address from the link sent to it"
+        return {"message": message, "data": update_data}
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -32,34 +45,36 @@ async def update_user(
     
 
 @router.get("/my_projects", status_code=200)
-async def my_projects(user = Depends(get_current_user)):
+async def my_projects(
+    request: Request,
+    view: str = Query("full", pattern=PROJECT_VIEW_PATTERN),
+    fields: Optional[str] = Query(None, description="Comma-separated project keys to return"),
+    user = Depends(get_current_user)
+):
     try:
         user_id = str(user.user.id)
+        field_list = parse_fields(fields, USER_PROJECT_FIELDS, view)
         
-        result = supabase.rpc('get_user_projects_with_images', {"user_id": user_id}).execute()
-        
-        projects_list = [json.loads(p) if isinstance(p, str) else p for p in result.data] if result.data else []
+        projects = await read_rpc_raw('get_user_projects_with_images', {
+            "user_id": user_id,
+            "p_view": view,
+            "p_fields": field_list,
+        })
         
-        return {
-            "status": "success",
-            "data": projects_list
-        }
+        return conditional_json(request, render_raw_data(projects), PRIVATE_REVALIDATE_CACHE_CONTROL)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error fetching projects: {str(e)}")
     
 @router.get("/my_reviews", status_code=200)
-async def my_reviews(user = Depends(get_current_user)):
+async def my_reviews(request: Request, user = Depends(get_current_user)):
     try:
         user_id = str(user.user.id)
         
-        result = supabase.schema("revx").rpc('get_user_reviews', {"user_id": user_id}).execute()
-        
-        reviews_list = [json.loads(r) if isinstance(r, str) else r for r in result.data] if result.data else []
+        reviews = await read_rpc_raw('get_user_reviews', {"user_id": user_id})
         
-        return {
-            "status": "success",
-            "data": reviews_list
-        }
+        return conditional_json(request, render_raw_data(reviews), PRIVATE_REVALIDATE_CACHE_CONTROL)
     except Exception as e:
         import traceback
         print(f"Error fetching reviews: {str(e)}")
@@ -1,179 +1,225 @@
 from fastapi import HTTPException
-from database import supabase
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+from database import supabase, execute, run_sync
+from services.profile_service import get_profile, cache_profile, invalidate_profile
+from services.suggest_service import unindex_project, unindex_user
+from services.job_service import enqueue_job, register_job
+from direct_db import read_rpc
+from typing import Dict, Any, AsyncIterator, List, Optional
+from utils.cache import TTLCache
+from utils.response_cache import response_cache, CATALOG_TAG, PROFILES_TAG
+from datetime import date, datetime, timedelta, timezone
+from dotenv import load_dotenv
+import asyncio
 import json
+import os
+
+load_dotenv()
+
+# Dashboard counters are shared between admin page refreshes for a short while
+ADMIN_METRICS_TTL = float(os.getenv("ADMIN_METRICS_TTL", "30"))
+
+# Tables whose totals may use planner estimates, e.g. "reviews,projects"
+ADMIN_METRICS_ESTIMATED_TABLES = [
+    table.strip() for table in os.getenv("ADMIN_METRICS_ESTIMATED_TABLES", "").split(",") if table.strip()
+]
+
+# Rows fetched per round trip while streaming an export
+ADMIN_EXPORT_PAGE_SIZE = int(os.getenv("ADMIN_EXPORT_PAGE_SIZE", "1000"))
+
+# kind -> (keyset-paged RPC, CSV columns)
+EXPORTS = {
+    "projects": ("admin_export_projects", [
+        "id", "title", "description", "owner_id", "owner_username",
+        "created_at", "review_count", "avg_rating", "tags",
+    ]),
+    "reviews": ("admin_export_reviews", [
+        "id", "project_id", "project_title", "user_id", "username",
+        "rating", "review", "created_at",
+    ]),
+    "users": ("admin_export_users", [
+        "id", "username", "full_name", "email", "is_admin",
+        "created_at", "project_count", "review_count",
+    ]),
+}
+
+_metrics_snapshot = TTLCache(maxsize=1, ttl=ADMIN_METRICS_TTL)
+_metrics_lock = asyncio.Lock()
 
 async def get_dashboard_metrics() -> Dict[str, Any]:
     """Get metrics for the admin dashboard"""
-    try:
-        # Get total counts
-        users_count = supabase.schema("revx").table("profile").select("id", count="exact").execute()
-        projects_count = supabase.schema("revx").table("projects").select("id", count="exact").execute()
-        reviews_count = supabase.schema("revx").table("reviews").select("id", count="exact").execute()
-        
-        # Get recent counts (last 30 days) using the created_at column
-        thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
-        
-        # Use the created_at column for profiles that you've added
-        recent_users = supabase.schema("revx").table("profile").select("id", count="exact")\
-            .gte("created_at", thirty_days_ago).execute()
-            
-        recent_projects = supabase.schema("revx").table("projects").select("id", count="exact")\
-            .gte("created_at", thirty_days_ago).execute()
+    snapshot = _metrics_snapshot.get("metrics")
+    if snapshot is not None:
+        return snapshot
+
+    # Concurrent dashboard refreshes share one database call
+    async with _metrics_lock:
+        snapshot = _metrics_snapshot.get("metrics")
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            # Get recent counts (last 30 days) using the created_at column
+            thirty_days_ago = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
             
-        return {
-            "total_users": users_count.count if hasattr(users_count, 'count') else 0,
-            "total_projects": projects_count.count if hasattr(projects_count, 'count') else 0,
-            "total_reviews": reviews_count.count if hasattr(reviews_count, 'count') else 0,
-            "recent_users": recent_users.count if hasattr(recent_users, 'count') else 0,
-            "recent_projects": recent_projects.count if hasattr(recent_projects, 'count') else 0
-        }
+            result = await execute(supabase.schema("revx").rpc('get_dashboard_metrics', {
+                "p_since": thirty_days_ago,
+                "p_estimate_tables": ADMIN_METRICS_ESTIMATED_TABLES
+            }))
+            counts = result.data or {}
+                
+            metrics = {
+                "total_users": counts.get("total_users", 0),
+                "total_projects": counts.get("total_projects", 0),
+                "total_reviews": counts.get("total_reviews", 0),
+                "recent_users": counts.get("recent_users", 0),
+                "recent_projects": counts.get("recent_projects", 0)
+            }
+            _metrics_snapshot.set("metrics", metrics)
+            return metrics
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error getting metrics: {str(e)}")
+
+async def get_activity_timeseries(start: date, end: date, bucket: str = "day") -> List[Dict[str, Any]]:
+    """Get signups, projects and reviews per day or week from the daily rollup"""
+    try:
+        result = await execute(supabase.schema("revx").rpc('get_activity_timeseries', {
+            "p_from": start.isoformat(),
+            "p_to": end.isoformat(),
+            "p_bucket": bucket
+        }))
+
+        return result.data or []
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting metrics: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error getting activity timeseries: {str(e)}")
 
 async def get_all_users(limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
     """Get all users with pagination"""
     try:
-        # Use created_at column for ordering and also select email
-        profiles = supabase.schema("revx").table("profile").select("*")\
-            .order("created_at", desc=True)\
-            .range(offset, offset + limit - 1)\
-            .execute()
-
-        # Get user emails from auth.users for the profiles
-        users_with_emails = []
-
-        for profile in profiles.data or []:
-            # Get the user email from auth.users based on the user ID
-            try:
-                # Fetch user email using a direct query to the auth.users table
-                auth_user = supabase.schema("auth").table("users").select("email").eq("id", profile.get("id")).single().execute()
-                email = auth_user.data.get("email") if auth_user.data else None
-            except Exception:
-                # If fetching from auth fails, email will be null
-                email = None
-
-            # Add email to the profile data
-            users_with_emails.append({
-                **profile,
-                "email": email
-            })
-
-        return users_with_emails
+        # Profiles and their auth emails come back from a single joined query
+        result = await execute(supabase.schema("revx").rpc('admin_list_users', {
+            "p_limit": limit,
+            "p_offset": offset
+        }))
+
+        return result.data or []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching users: {str(e)}")
 
 async def get_all_projects(limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
     """Get all projects with pagination"""
     try:
-        # Get projects with just the essential information
-        projects = supabase.schema("revx").table("projects").select(
-            "id, title, description, owner_id, created_at"
-        ).range(offset, offset + limit - 1).execute()
-        
-        project_list = []
-        
-        if projects.data:
-            for project in projects.data:
-                project_id = project.get("id")
-                
-                # Get project owner username
-                owner = supabase.schema("revx").table("profile").select("username")\
-                    .eq("id", project.get("owner_id")).single().execute()
-                owner_username = owner.data.get("username") if owner.data else "Unknown"
-                
-                # Get average rating
-                reviews = supabase.schema("revx").table("reviews").select("rating")\
-                    .eq("project_id", project_id).execute()
-                
-                avg_rating = 0
-                if reviews.data and len(reviews.data) > 0:
-                    ratings = [review.get("rating", 0) for review in reviews.data]
-                    avg_rating = sum(ratings) / len(ratings)
-                
-                # Create simplified project data object
-                project_data = {
-                    "id": project.get("id"),
-                    "title": project.get("title"),
-                    "owner_id": project.get("owner_id"),
-                    "owner_username": owner_username,
-                    "created_at": project.get("created_at"),
-                    "avg_rating": avg_rating
-                }
-                
-                project_list.append(project_data)
-        
-        return project_list
+        # Owner usernames and average ratings are joined in the database
+        result = await execute(supabase.schema("revx").rpc('admin_list_projects', {
+            "p_limit": limit,
+            "p_offset": offset
+        }))
+
+        return result.data or []
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
 
+async def _export_page(function: str, after_id: Any) -> List[Dict[str, Any]]:
+    return await read_rpc(function, {
+        "p_after_id": after_id,
+        "p_limit": ADMIN_EXPORT_PAGE_SIZE
+    }) or []
+
+async def _export_pages(kind: str, rows: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    function, _ = EXPORTS[kind]
+    try:
+        while True:
+            if rows:
+                yield rows
+            if len(rows) < ADMIN_EXPORT_PAGE_SIZE:
+                return
+            rows = await _export_page(function, rows[-1]["id"])
+    except Exception as e:
+        # Re-raised so the server aborts the chunked response without its final
+        # chunk: the client sees a failed download, never a short but valid file
+        print(f"Error exporting {kind}: {str(e)}")
+        raise
+
+async def open_export(kind: str) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Every row of an export, one page at a time, paging by the last id seen.
+
+    The first page is fetched before returning, so a broken export fails with
+    an HTTP error instead of an empty 200.
+    """
+    function, _ = EXPORTS[kind]
+    try:
+        first = await _export_page(function, None)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting {kind}: {str(e)}")
+    return _export_pages(kind, first)
+
 async def toggle_user_admin_status(user_id: str, is_admin: bool) -> Dict[str, Any]:
     """Toggle a user's admin status"""
     try:
         # Check if user exists
-        user_check = supabase.schema("revx").table("profile").select("*").eq("id", user_id).single().execute()
+        user_check = await get_profile(user_id)
         
-        if not user_check.data:
+        if not user_check:
             raise HTTPException(status_code=404, detail="User not found")
             
         # Update admin status
-        update_data = supabase.schema("revx").table("profile")\
+        update_data = await execute(supabase.schema("revx").table("profile")\
             .update({"is_admin": is_admin})\
-            .eq("id", user_id)\
-            .execute()
+            .eq("id", user_id))
             
+        invalidate_profile(user_id)
+        if update_data.data:
+            cache_profile(update_data.data[0])
         return update_data.data[0] if update_data.data else {}
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating user admin status: {str(e)}")
 
-async def delete_user(user_id: str) -> Dict[str, Any]:
-    """Delete a user and all their associated data"""
+async def delete_user(user_id: str, requested_by: Optional[str] = None) -> Dict[str, Any]:
+    """Queue deletion of a user and all their associated data"""
     try:
         # Check if user exists
-        user_check = supabase.schema("revx").table("profile").select("*").eq("id", user_id).single().execute()
+        user_check = await get_profile(user_id)
         
-        if not user_check.data:
+        if not user_check:
             raise HTTPException(status_code=404, detail="User not found")
-            
-        # 1. Delete reviews by this user
-        supabase.schema("revx").table("reviews").delete().eq("user_id", user_id).execute()
-        
-        # 2. Delete projects created by this user (this will cascade delete project images, tags, etc.)
-        projects = supabase.schema("revx").table("projects").select("id").eq("owner_id", user_id).execute()
-        
-        for project in projects.data or []:
-            project_id = project.get("id")
-            if project_id:
-                # Delete reviews for this project
-                supabase.schema("revx").table("reviews").delete().eq("project_id", project_id).execute()
-                
-                # Delete contributors
-                supabase.schema("revx").table("contributors").delete().eq("project_id", project_id).execute()
-                
-                # Delete project images
-                supabase.schema("revx").table("project_images").delete().eq("project_id", project_id).execute()
-                
-                # Delete project tags
-                supabase.schema("revx").table("project_R_tag").delete().eq("project_id", project_id).execute()
-                
-        # 3. Delete projects 
-        supabase.schema("revx").table("projects").delete().eq("owner_id", user_id).execute()
-        
-        # 4. Delete profile
-        profile_delete = supabase.schema("revx").table("profile").delete().eq("id", user_id).execute()
-        
-        # 5. Delete user from auth
-        try:
-            supabase.auth.admin.delete_user(user_id)
-        except Exception as auth_err:
-            # Continue even if auth deletion fails
-            print(f"Error deleting user from auth: {str(auth_err)}")
-            
-        return {"id": user_id, "deleted": True}
+
+        return await enqueue_job("delete_user", {
+            "user_id": user_id,
+            "username": user_check.get("username")
+        }, created_by=requested_by)
     except HTTPException as e:
         raise e
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting user: {str(e)}")
+
+async def _delete_user_data(payload: Dict[str, Any]) -> Dict[str, Any]:
+    user_id = payload["user_id"]
+
+    # Reviews, owned projects with their dependent rows, contributions and
+    # the profile go in one transactional procedure
+    result = await execute(supabase.schema("revx").rpc('delete_user_cascade', {
+        "p_user_id": user_id
+    }))
+
+    invalidate_profile(user_id, payload.get("username"))
+    unindex_user(user_id)
+    for project_id in (result.data or {}).get("project_ids") or []:
+        unindex_project(project_id)
+    response_cache.invalidate(CATALOG_TAG, PROFILES_TAG)
+
+    # A retried step finds nothing left to delete
+    return {"related_data_deleted": (result.data or {}).get("related_data_deleted")}
+
+async def _delete_auth_user(payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        await run_sync(supabase.auth.admin.delete_user, payload["user_id"])
+    except Exception as e:
+        if getattr(e, "status", None) != 404:
+            raise
+    return {"deleted": True}
+
+register_job("delete_user", [
+    ("delete_data", _delete_user_data),
+    ("delete_auth_user", _delete_auth_user),
+])
@@ -1,5 +1,7 @@
 from fastapi import HTTPException
-from database import supabase
+from database import supabase, execute, run_auth
+from services.profile_service import cache_profile
+from services.suggest_service import index_user
 from typing import Dict, Any
 
 async def create_user_profile(
@@ -19,37 +21,47 @@ async def create_user_profile(
             "avatar": avatar,
         }
 
-        res = supabase.schema("revx").table("profile").insert(profile_data).execute()
+        res = await execute(supabase.schema("revx").table("profile").insert(profile_data))
 
         if not res.data:
             raise HTTPException(status_code=500, detail="Failed to create user profile")
         
+        cache_profile(res.data[0])
+        index_user(res.data[0])
         return res.data[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating user profile: {str(e)}")
 
 async def change_password_service(user_id: str, email: str, current_password: str, new_password: str) -> bool:
-    try:
-        # Verify current password
+    def verify_and_update(auth) -> bool:
+        # Verify current password on a private session, then update through it
         try:
-            auth_res = supabase.auth.sign_in_with_password({
+            auth_res = auth.sign_in_with_password({
                 "email": email,
                 "password": current_password
             })
-            
-            if not auth_res.user:
-                raise HTTPException(status_code=400, detail="Current password is incorrect")
-        except Exception as e:
-            raise HTTPException(status_code=400, detail="Current password is incorrect")
-        
-        # Update password using the user session instead of admin API
+        except Exception:
+            return False
+        if not auth_res.user:
+            return False
+
         try:
-            # Using the session from sign-in to update the user's password
-            supabase.auth.update_user({"password": new_password})
-            return True
+            auth.update_user({"password": new_password})
+        finally:
+            # Don't leave the verification session behind on the server
+            auth.sign_out({"scope": "local"})
+        return True
+
+    try:
+        try:
+            verified = await run_auth(verify_and_update)
         except Exception as e:
             print(f"Password update error: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error updating password: {str(e)}")
+
+        if not verified:
+            raise HTTPException(status_code=400, detail="Current password is incorrect")
+        return True
         
     except HTTPException as e:
         raise e
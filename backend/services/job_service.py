@@ -0,0 +1,197 @@
+from database import supabase, execute
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+import asyncio
+import os
+
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Tries per step within one run, and runs (claims) per job before it fails
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "1"))
+# A running job whose heartbeat is older than this is assumed orphaned
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+JOB_SWEEP_INTERVAL = float(os.getenv("JOB_SWEEP_INTERVAL", "60"))
+
+# A job kind is an ordered list of named steps. Each step receives the job
+# payload and must be safe to run again: finished steps are recorded in
+# progress and skipped when a job resumes after a restart.
+JobStep = Tuple[str, Callable[[Dict[str, Any]], Awaitable[Any]]]
+_job_kinds: Dict[str, List[JobStep]] = {}
+
+_queue: Optional[asyncio.Queue] = None
+_tasks: List[asyncio.Task] = []
+
+def register_job(kind: str, steps: List[JobStep]) -> None:
+    _job_kinds[kind] = steps
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _jobs():
+    return supabase.schema("revx").table("admin_jobs")
+
+def _stale_before() -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=JOB_LEASE_SECONDS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+# Queued, or running with an expired lease
+_CLAIMABLE = "status.eq.queued,and(status.eq.running,updated_at.lt.{stale_before})"
+
+async def enqueue_job(kind: str, payload: Dict[str, Any], created_by: Optional[str] = None) -> Dict[str, Any]:
+    """Persist a job and hand it to the local workers"""
+    if kind not in _job_kinds:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    res = await execute(_jobs().insert({
+        "kind": kind,
+        "payload": payload,
+        "created_by": created_by,
+        "progress": {"completed_steps": [], "total_steps": len(_job_kinds[kind])},
+    }))
+    job = res.data[0]
+    if _queue is not None:
+        _queue.put_nowait(job["id"])
+    return job
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    res = await execute(_jobs().select("*").eq("id", job_id))
+    return res.data[0] if res.data else None
+
+async def _claim(job_id: str) -> Optional[Dict[str, Any]]:
+    """Atomically take a queued job, or a running one whose lease expired,
+    unless it has already been claimed JOB_MAX_ATTEMPTS times"""
+    job = await get_job(job_id)
+    if not job:
+        return None
+    res = await execute(_jobs().update({
+        "status": "running",
+        "attempts": job["attempts"] + 1,
+        "updated_at": _now(),
+    }).eq("id", job_id).eq("attempts", job["attempts"])\
+        .lt("attempts", JOB_MAX_ATTEMPTS)\
+        .or_(_CLAIMABLE.format(stale_before=_stale_before())))
+    return res.data[0] if res.data else None
+
+async def _run_step(step: Callable[[Dict[str, Any]], Awaitable[Any]], payload: Dict[str, Any]) -> Any:
+    """Run one step, retrying failures with exponential backoff"""
+    for attempt in range(1, JOB_MAX_ATTEMPTS + 1):
+        try:
+            return await step(payload)
+        except Exception:
+            if attempt == JOB_MAX_ATTEMPTS:
+                raise
+            await asyncio.sleep(JOB_RETRY_DELAY * 2 ** (attempt - 1))
+
+class _LeaseLost(Exception):
+    """The job was taken over by another worker after its lease expired"""
+
+async def _update_claimed(job: Dict[str, Any], values: Dict[str, Any]) -> None:
+    """Write to a job only while this worker still holds its claim"""
+    res = await execute(_jobs().update({**values, "updated_at": _now()})\
+        .eq("id", job["id"]).eq("attempts", job["attempts"]))
+    if not res.data:
+        raise _LeaseLost(job["id"])
+
+async def _heartbeat(job: Dict[str, Any]) -> None:
+    """Keep the lease fresh while a long step runs, so the sweeper leaves it alone"""
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        try:
+            await _update_claimed(job, {})
+        except _LeaseLost:
+            return
+        except Exception as e:
+            # A missed beat is fine; the lease covers two more
+            print(f"Error renewing lease of job {job['id']}: {str(e)}")
+
+async def _run_job(job_id: str) -> None:
+    job = await _claim(job_id)
+    if not job:
+        return
+
+    steps = _job_kinds.get(job["kind"], [])
+    progress = job.get("progress") or {}
+    completed = list(progress.get("completed_steps") or [])
+    results = dict(progress.get("results") or {})
+    heartbeat = asyncio.create_task(_heartbeat(job))
+    try:
+        for name, step in steps:
+            if name in completed:
+                continue
+            results[name] = await _run_step(step, job["payload"])
+            completed.append(name)
+            await _update_claimed(job, {
+                "progress": {"completed_steps": completed, "total_steps": len(steps), "results": results},
+            })
+
+        await _update_claimed(job, {
+            "status": "succeeded",
+            "result": results,
+            "error": None,
+        })
+    except _LeaseLost:
+        # Whoever holds the job now records its outcome
+        print(f"Job {job_id} was taken over by another worker")
+    except Exception as e:
+        try:
+            await _update_claimed(job, {
+                "status": "failed",
+                "error": str(e),
+            })
+        except _LeaseLost:
+            print(f"Job {job_id} was taken over by another worker")
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+
+async def _worker() -> None:
+    while True:
+        job_id = await _queue.get()
+        try:
+            await _run_job(job_id)
+        except Exception as e:
+            print(f"Error running job {job_id}: {str(e)}")
+        finally:
+            _queue.task_done()
+
+async def _enqueue_pending() -> None:
+    """Pick up queued jobs and jobs orphaned by a crashed or restarted worker"""
+    stale_before = _stale_before()
+
+    # A job that keeps killing or hanging its worker is given up on, so it is
+    # not resumed forever and whoever polls it sees the failure
+    await execute(_jobs().update({
+        "status": "failed",
+        "error": f"Abandoned after {JOB_MAX_ATTEMPTS} attempts without finishing",
+        "updated_at": _now(),
+    }).eq("status", "running").lt("updated_at", stale_before).gte("attempts", JOB_MAX_ATTEMPTS))
+
+    res = await execute(_jobs().select("id")\
+        .lt("attempts", JOB_MAX_ATTEMPTS)\
+        .or_(_CLAIMABLE.format(stale_before=stale_before))\
+        .order("created_at"))
+    for job in res.data or []:
+        _queue.put_nowait(job["id"])
+
+async def _sweeper() -> None:
+    while True:
+        await asyncio.sleep(JOB_SWEEP_INTERVAL)
+        try:
+            await _enqueue_pending()
+        except Exception as e:
+            print(f"Error sweeping pending jobs: {str(e)}")
+
+async def start_job_workers() -> None:
+    global _queue
+    _queue = asyncio.Queue()
+    _tasks.extend(asyncio.create_task(_worker()) for _ in range(JOB_WORKERS))
+    _tasks.append(asyncio.create_task(_sweeper()))
+    await _enqueue_pending()
+
+async def stop_job_workers() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
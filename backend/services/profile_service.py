@@ -0,0 +1,69 @@
+from database import supabase, execute
+from utils.cache import TTLCache
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+import os
+
+load_dotenv()
+
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "4096"))
+
+# Profile rows keyed by user id, plus a username -> user id index
+_profiles_by_id = TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+_ids_by_username = TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+
+def cache_profile(profile: Dict[str, Any]) -> None:
+    """Store a freshly read or written profile row"""
+    if not profile or not profile.get("id"):
+        return
+    user_id = str(profile["id"])
+    _profiles_by_id.set(user_id, dict(profile))
+    if profile.get("username"):
+        _ids_by_username.set(profile["username"], user_id)
+
+def invalidate_profile(user_id: Optional[str] = None, username: Optional[str] = None) -> None:
+    """Drop cached entries after a profile write"""
+    if user_id:
+        cached = _profiles_by_id.pop(str(user_id))
+        if cached and cached.get("username"):
+            _ids_by_username.pop(cached["username"])
+    if username:
+        _ids_by_username.pop(username)
+
+async def get_profile(user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a profile row by user id, reading through the cache"""
+    user_id = str(user_id)
+    cached = _profiles_by_id.get(user_id)
+    if cached is not None:
+        return dict(cached)
+
+    res = await execute(supabase.schema("revx").table("profile").select("*").eq("id", user_id))
+    if not res.data:
+        return None
+
+    cache_profile(res.data[0])
+    return dict(res.data[0])
+
+async def get_profile_by_username(username: str) -> Optional[Dict[str, Any]]:
+    """Get a profile row by username, reading through the cache"""
+    user_id = _ids_by_username.get(username)
+    if user_id is not None:
+        profile = await get_profile(user_id)
+        # The username may have changed since the index entry was written
+        if profile and profile.get("username") == username:
+            return profile
+        _ids_by_username.pop(username)
+
+    res = await execute(supabase.schema("revx").table("profile").select("*").eq("username", username))
+    if not res.data:
+        return None
+
+    cache_profile(res.data[0])
+    return dict(res.data[0])
+
+def profile_cache_stats() -> Dict[str, Any]:
+    return {
+        "by_id": _profiles_by_id.stats(),
+        "by_username": _ids_by_username.stats(),
+    }
@@ -1,6 +1,11 @@
 from fastapi import HTTPException
-from database import supabase
-from typing import Dict, Any, List
+from database import supabase, execute
+from direct_db import read_rpc, read_rpc_raw
+from typing import Dict, Any, List, Optional
+from utils.pagination import encode_cursor, decode_cursor
+from services.suggest_service import index_project, unindex_project
+from services.tag_service import validate_tag_ids
+from postgrest.exceptions import APIError
 from uuid import UUID
 
 async def create_project_service(
@@ -11,92 +16,173 @@ async def create_project_service(
         tags: List[str] = None,
 ) -> Dict[str, Any]:
     try:
-        project_data = {
-            "title": title,
-            "description": description,
-            "owner_id": user_id,
-        }
+        # Reject unknown tags before the project row is written
+        tag_ids = await validate_tag_ids(tags)
 
-        res = supabase.schema("revx").table("projects").insert(project_data).execute()
+        # The project, its images and its tag links are written in one
+        # transaction that returns the assembled project document
+        res = await execute(supabase.schema("revx").rpc('create_project', {
+            "p_title": title,
+            "p_description": description,
+            "p_owner_id": user_id,
+            "p_images": images or [],
+            "p_tag_ids": tag_ids,
+        }))
 
         if not res.data:
             raise HTTPException(status_code=500, detail="Failed to create project")
         
-        project_id = res.data[0]["id"]
-        
-        if images:
-            image_data_list = []
-            for image in images:
-                image_data_list.append({
-                    "project_id": project_id,
-                    "image_link": image,
-                })
-            
-            res_image = supabase.schema("revx").table("project_images").insert(image_data_list).execute()
-            
-            if not res_image.data:
-                raise HTTPException(status_code=500, detail="Failed to add images to project")
-        
-        if tags:
-            tag_data_list = []
-            for tag in tags:
-                try:
-                    # Convert tag to integer to ensure correct type
-                    tag_id = int(tag)
-                    tag_data_list.append({
-                        "project_id": project_id,
-                        "tag_id": tag_id,
-                    })
-                except (ValueError, TypeError):
-                    # Skip invalid tag IDs
-                    continue
-            
-            if tag_data_list:  # Only insert if we have valid tags
-                res_tag = supabase.schema("revx").table("project_R_tag").insert(tag_data_list).execute()
-                
-                if not res_tag.data:
-                    raise HTTPException(status_code=500, detail="Failed to add tags to project")
-        
-        complete_project = await get_project_with_details(str(project_id))
-        return complete_project
+        index_project(res.data["id"], title)
+        return res.data
         
     except HTTPException as e:
         raise e
+    except APIError as e:
+        # The unique title constraint replaces a racy existence pre-check
+        if e.code == "23505":
+            raise HTTPException(status_code=400, detail="Project with this title already exists")
+        if e.code == "23503":
+            # Tags were validated above, so name the key that actually failed
+            violation = f"{e.message or ''} {e.details or ''}"
+            if "project_r_tag" in violation.lower() or "(tag_id)" in violation:
+                raise HTTPException(status_code=400, detail="Unknown tag ids")
+            if "(owner_id)" in violation:
+                raise HTTPException(status_code=400, detail="Project owner does not exist")
+        raise HTTPException(status_code=500, detail=f"Error creating project: {e.message}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating project: {str(e)}")
     
-async def list_projects_service() -> List[Dict[str, Any]]:
+async def sync_project_images(project_id: str, images: List[str]) -> Dict[str, List[str]]:
+    """Bring a project's images in line with `images`, touching only the rows that differ"""
+    current = await execute(supabase.schema("revx").table("project_images")\
+        .select("image_link")\
+        .eq("project_id", project_id))
+    current_links = {row["image_link"] for row in current.data or []}
+    wanted = list(dict.fromkeys(images))
+
+    added = [link for link in wanted if link not in current_links]
+    removed = sorted(current_links - set(wanted))
+
+    if removed:
+        await execute(supabase.schema("revx").table("project_images")\
+            .delete()\
+            .eq("project_id", project_id)\
+            .in_("image_link", removed))
+    if added:
+        res = await execute(supabase.schema("revx").table("project_images").insert([
+            {"project_id": project_id, "image_link": link} for link in added
+        ]))
+        if not res.data:
+            raise HTTPException(status_code=500, detail="Failed to update project images")
+
+    return {"added": added, "removed": removed}
+
+async def sync_project_tags(project_id: str, tag_ids: List[int]) -> Dict[str, List[int]]:
+    """Bring a project's tag links in line with `tag_ids`, touching only the rows that differ"""
+    current = await execute(supabase.schema("revx").table("project_R_tag")\
+        .select("tag_id")\
+        .eq("project_id", project_id))
+    current_ids = {row["tag_id"] for row in current.data or []}
+
+    added = [tag_id for tag_id in tag_ids if tag_id not in current_ids]
+    removed = sorted(current_ids - set(tag_ids))
+
+    if removed:
+        await execute(supabase.schema("revx").table("project_R_tag")\
+            .delete()\
+            .eq("project_id", project_id)\
+            .in_("tag_id", removed))
+    if added:
+        res = await execute(supabase.schema("revx").table("project_R_tag").insert([
+            {"project_id": project_id, "tag_id": tag_id} for tag_id in added
+        ]))
+        if not res.data:
+            raise HTTPException(status_code=500, detail="Failed to update project tags")
+
+    return {"added": added, "removed": removed}
+
+async def list_projects_payload(
+    limit: int = 24,
+    cursor: Optional[str] = None,
+    view: str = "full",
+    fields: Optional[List[str]] = None,
+) -> bytes:
+    """One catalog page ordered by (avg_rating, created_at, id) descending, as the
+    raw {"data", "next_cursor"} JSON built by the database"""
+    after = decode_cursor(cursor, 3)
     try:
-        result = supabase.schema("revx").rpc('list_projects_with_details', {}).execute()
+        return await read_rpc_raw('list_projects_page_payload', {
+            "p_limit": limit,
+            "p_cursor_rating": after[0] if after else None,
+            "p_cursor_created_at": after[1] if after else None,
+            "p_cursor_id": after[2] if after else None,
+            "p_view": view,
+            "p_fields": fields,
+        })
         
-        if not result.data:
-            return []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
+
+async def search_projects_service(
+    query: Optional[str] = None,
+    tag_ids: Optional[List[int]] = None,
+    limit: int = 24,
+    cursor: Optional[str] = None,
+    view: str = "full",
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Relevance-ordered keyword search over titles and descriptions, filtered by tags.
+
+    fields must keep rank and id, which the next cursor is built from.
+    """
+    after = decode_cursor(cursor, 2)
+    try:
+        result = await execute(supabase.schema("revx").rpc('search_projects', {
+            "p_query": query,
+            "p_tag_ids": tag_ids or None,
+            "p_limit": limit + 1,
+            "p_cursor_rank": after[0] if after else None,
+            "p_cursor_id": after[1] if after else None,
+            "p_view": view,
+            "p_fields": fields,
+        }))
         
-        if isinstance(result.data, list) and len(result.data) == 1 and isinstance(result.data[0], list):
-            return result.data[0]
-        elif isinstance(result.data, list):
-            return result.data
-        else:
-            import json
-            if isinstance(result.data, str):
-                parsed_data = json.loads(result.data)
-                if isinstance(parsed_data, list) and len(parsed_data) == 1 and isinstance(parsed_data[0], list):
-                    return parsed_data[0]
-                return parsed_data
-            else:
-                return [result.data]
+        projects = result.data or []
+        next_cursor = None
+        if len(projects) > limit:
+            projects = projects[:limit]
+            last = projects[-1]
+            next_cursor = encode_cursor([last["rank"], last["id"]])
+        
+        return {
+            "data": projects,
+            "next_cursor": next_cursor
+        }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error fetching projects: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching projects: {str(e)}")
+
+async def get_project_payload(project_id: str) -> bytes:
+    """The project document as raw JSON bytes, for responses that pass it through"""
+    if not str(project_id).isdigit():
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        payload = await read_rpc_raw('get_project_with_details', {"project_id": int(project_id)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching project details: {str(e)}")
+
+    if payload.strip() == b"null":
+        raise HTTPException(status_code=404, detail="Project not found")
+    return payload
 
 async def get_project_with_details(project_id: str) -> Dict[str, Any]:
     try:
-        result = supabase.schema("revx").rpc('get_project_with_details', {"project_id": int(project_id)}).execute()
+        project = await read_rpc('get_project_with_details', {"project_id": int(project_id)})
         
-        if not result.data:
+        if not project:
             raise HTTPException(status_code=404, detail="Project not found")
         
-        return result.data
+        return project
         
     except HTTPException as e:
         raise e
@@ -114,7 +200,7 @@ async def add_contributor_service(
             "status": False,
         }
 
-        res = supabase.schema("revx").table("contributors").insert(contributor_data).execute()
+        res = await execute(supabase.schema("revx").table("contributors").insert(contributor_data))
 
         if not res.data:
             raise HTTPException(status_code=500, detail="Failed to add contributor")
@@ -132,21 +218,40 @@ async def add_review_service(
     rating: str
 ) -> Dict[str, Any]:
     try:
-        review_data = {
-            "project_id": project_id,
-            "user_id": user_id,
-            "review": review,
-            "rating": rating,
-        }
+        try:
+            rating_value = int(rating)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Rating must be a number from 1 to 5")
+        if not 1 <= rating_value <= 5:
+            raise HTTPException(status_code=400, detail="Rating must be a number from 1 to 5")
+        if not str(project_id).isdigit():
+            raise HTTPException(status_code=404, detail="Project not found")
 
-        res = supabase.schema("revx").table("reviews").insert(review_data).execute()
+        # The procedure enforces the project/owner rules and the unique
+        # (project_id, user_id) constraint in the same transaction as the insert
+        res = await execute(supabase.schema("revx").rpc('submit_review', {
+            "p_project_id": int(project_id),
+            "p_user_id": user_id,
+            "p_review": review,
+            "p_rating": rating_value,
+        }))
 
         if not res.data:
             raise HTTPException(status_code=500, detail="Failed to add review")
         
-        return res.data[0]
+        return res.data
     except HTTPException as e:
         raise e
+    except APIError as e:
+        if e.code == "P0002":
+            raise HTTPException(status_code=404, detail="Project not found")
+        if e.code == "P0001":
+            raise HTTPException(status_code=400, detail="You cannot review your own project")
+        if e.code == "23505":
+            raise HTTPException(status_code=409, detail="User can only review a project once")
+        if e.code == "23514":
+            raise HTTPException(status_code=400, detail="Rating must be a number from 1 to 5")
+        raise HTTPException(status_code=500, detail=f"Error adding review: {e.message}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding review: {str(e)}")
     
@@ -154,37 +259,26 @@ async def delete_project_service(
     project_id: str,
 ) -> Dict[str, Any]:
     try:
-        # Direct table operations, no type conversions needed
-        
-        # 1. Delete reviews
-        reviews_result = supabase.schema("revx").table("reviews").delete().eq("project_id", project_id).execute()
-        
-        # 2. Delete contributors
-        contributors_result = supabase.schema("revx").table("contributors").delete().eq("project_id", project_id).execute()
-        
-        # 3. Delete project images
-        images_result = supabase.schema("revx").table("project_images").delete().eq("project_id", project_id).execute()
-        
-        # 4. Delete project tags relationship
-        tags_result = supabase.schema("revx").table("project_R_tag").delete().eq("project_id", project_id).execute()
-        
-        # 5. Finally delete the project itself
-        project_result = supabase.schema("revx").table("projects").delete().eq("id", project_id).execute()
+        if not str(project_id).isdigit():
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        # Reviews, contributors, images, tag links and the project itself are
+        # removed by one transactional procedure
+        result = await execute(supabase.schema("revx").rpc('delete_project_cascade', {
+            "p_project_id": int(project_id)
+        }))
         
-        if not project_result.data:
+        if not result.data:
             raise HTTPException(status_code=404, detail="Project not found")
         
+        unindex_project(project_id)
+        
         return {
             "status": "success",
             "message": "Project deleted successfully",
             "data": {
                 "project_id": project_id,
-                "related_data_deleted": {
-                    "reviews": len(reviews_result.data) if reviews_result.data else 0,
-                    "contributors": len(contributors_result.data) if contributors_result.data else 0,
-                    "images": len(images_result.data) if images_result.data else 0, 
-                    "tags": len(tags_result.data) if tags_result.data else 0
-                }
+                "related_data_deleted": result.data["related_data_deleted"]
             }
         }
     except HTTPException as e:
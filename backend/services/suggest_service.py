@@ -0,0 +1,73 @@
+from database import supabase, execute
+from utils.prefix_index import PrefixIndex
+from typing import Dict, Any, List, Mapping
+import asyncio
+
+# PostgREST caps rows per request, so startup loads page through each table
+_LOAD_PAGE_SIZE = 1000
+
+_indexes: Dict[str, PrefixIndex] = {
+    "project": PrefixIndex(),
+    "user": PrefixIndex(),
+    "tag": PrefixIndex(),
+}
+
+async def _fetch_all(table: str, columns: str) -> List[Dict[str, Any]]:
+    rows = []
+    offset = 0
+    while True:
+        res = await execute(supabase.schema("revx").table(table).select(columns)\
+            .order("id")\
+            .range(offset, offset + _LOAD_PAGE_SIZE - 1))
+        rows.extend(res.data or [])
+        if not res.data or len(res.data) < _LOAD_PAGE_SIZE:
+            return rows
+        offset += _LOAD_PAGE_SIZE
+
+async def build_suggest_indexes() -> None:
+    """Load project titles and usernames into the prefix indexes.
+
+    Tag names are fed in by the tag catalog whenever it (re)loads.
+    """
+    projects, profiles = await asyncio.gather(
+        _fetch_all("projects", "id, title"),
+        _fetch_all("profile", "id, username, full_name, avatar"),
+    )
+    _indexes["project"].replace_all([
+        (p["id"], p["title"], _project_entry(p["id"], p["title"])) for p in projects
+    ])
+    _indexes["user"].replace_all([
+        (u["id"], u["username"], _user_entry(u)) for u in profiles
+    ])
+
+def _project_entry(project_id, title: str) -> Dict[str, Any]:
+    return {"id": project_id, "title": title}
+
+def _user_entry(profile: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": profile["id"],
+        "username": profile["username"],
+        "full_name": profile.get("full_name"),
+        "avatar": profile.get("avatar"),
+    }
+
+def index_project(project_id, title: str) -> None:
+    _indexes["project"].add(project_id, title, _project_entry(project_id, title))
+
+def unindex_project(project_id) -> None:
+    _indexes["project"].remove(project_id)
+
+def index_user(profile: Dict[str, Any]) -> None:
+    _indexes["user"].add(profile["id"], profile["username"], _user_entry(profile))
+
+def unindex_user(user_id) -> None:
+    _indexes["user"].remove(user_id)
+
+def replace_tag_index(tags: Mapping[int, str]) -> None:
+    _indexes["tag"].replace_all([
+        (tag_id, name, {"tag_id": tag_id, "tag_name": name}) for tag_id, name in tags.items()
+    ])
+
+def suggest(prefix: str, kind: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Answer a prefix query from memory, without touching the database"""
+    return _indexes[kind].search(prefix, limit)
@@ -0,0 +1,92 @@
+from fastapi import HTTPException
+from database import supabase, execute
+from services.suggest_service import replace_tag_index
+from utils.http_cache import RenderedJSON, render_json
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
+from dotenv import load_dotenv
+import asyncio
+import os
+
+load_dotenv()
+
+# Tags are edited by hand in the database, so a slow refresh is plenty
+TAG_CATALOG_REFRESH_INTERVAL = float(os.getenv("TAG_CATALOG_REFRESH_INTERVAL", "600"))
+
+class TagCatalog:
+    """Immutable id <-> name map of all tags, with the /project/tags body pre-rendered"""
+
+    def __init__(self, rows: List[Dict[str, Any]]):
+        self.by_id: Mapping[int, str] = MappingProxyType({
+            row["id"]: row["tag_name"] for row in rows
+        })
+        self.by_name: Mapping[str, int] = MappingProxyType({
+            name.casefold(): tag_id for tag_id, name in self.by_id.items()
+        })
+        self.rendered: RenderedJSON = render_json({
+            "status": "success",
+            "data": [
+                {"tag_id": tag_id, "tag_name": name}
+                for tag_id, name in sorted(self.by_id.items())
+            ]
+        })
+
+# Replaced wholesale on reload, so readers never see a half-built catalog
+_catalog: Optional[TagCatalog] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+async def load_tag_catalog() -> TagCatalog:
+    global _catalog
+    res = await execute(supabase.schema("revx").table("tags").select("id, tag_name").order("id"))
+    catalog = TagCatalog(res.data or [])
+    _catalog = catalog
+    replace_tag_index(catalog.by_id)
+    return catalog
+
+async def get_tag_catalog() -> TagCatalog:
+    """The warm catalog; only loaded on demand if startup could not load it"""
+    return _catalog or await load_tag_catalog()
+
+async def validate_tag_ids(tags: Optional[List[Any]]) -> List[int]:
+    """Convert incoming tag ids to ints, rejecting any that are not known tags"""
+    if not tags:
+        return []
+
+    catalog = await get_tag_catalog()
+    tag_ids = []
+    invalid = []
+    for tag in tags:
+        try:
+            tag_id = int(tag)
+        except (ValueError, TypeError):
+            invalid.append(str(tag))
+            continue
+        if tag_id not in catalog.by_id:
+            invalid.append(str(tag))
+        elif tag_id not in tag_ids:
+            tag_ids.append(tag_id)
+
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Unknown tag ids: {', '.join(invalid)}")
+    return tag_ids
+
+async def _refresh_loop() -> None:
+    while True:
+        await asyncio.sleep(TAG_CATALOG_REFRESH_INTERVAL)
+        try:
+            await load_tag_catalog()
+        except Exception as e:
+            # Keep serving the previous catalog until the next tick
+            print(f"Error refreshing tag catalog: {str(e)}")
+
+def start_tag_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is None and TAG_CATALOG_REFRESH_INTERVAL > 0:
+        _refresh_task = asyncio.create_task(_refresh_loop())
+
+async def stop_tag_refresh() -> None:
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        await asyncio.gather(_refresh_task, return_exceptions=True)
+        _refresh_task = None
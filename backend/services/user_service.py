@@ -1,11 +1,16 @@
 from fastapi import HTTPException
-from database import supabase
+from database import supabase, execute, run_auth
+from services.profile_service import get_profile, get_profile_by_username, cache_profile, invalidate_profile
+from services.suggest_service import index_user
+from gotrue.types import Session, User
 from typing import Dict, Any, Optional
 from pydantic import EmailStr
 
 async def update_user_service(
     user_id: str,
     current_email: EmailStr,
+    current_user: User,
+    access_token: str,
     email: Optional[str] = None,
     password: Optional[str] = None,
     username: Optional[str] = None,
@@ -14,16 +19,16 @@ async def update_user_service(
     avatar: Optional[str] = None,
 ) -> Dict[str, Any]:
     try:
-        current_profile = supabase.schema("revx").table("profile").select("*").eq("id", user_id).execute()
+        current_profile = await get_profile(user_id)
 
-        if not current_profile.data:
+        if not current_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Update profile in database
         profile_updates = {}
         if username is not None:
-            username_check = supabase.schema("revx").table("profile").select("id").eq("username", username).execute()
-            if username_check.data and str(username_check.data[0]["id"]) != user_id:
+            username_owner = await get_profile_by_username(username)
+            if username_owner and str(username_owner["id"]) != user_id:
                 raise HTTPException(status_code=400, detail="Username already taken")
             profile_updates["username"] = username
 
@@ -36,8 +41,15 @@ async def update_user_service(
         if avatar is not None:
             profile_updates["avatar"] = avatar
 
+        updated_profile = current_profile
         if profile_updates:
-            supabase.schema("revx").table("profile").update(profile_updates).eq("id", user_id).execute()
+            invalidate_profile(user_id)
+            update_res = await execute(supabase.schema("revx").table("profile").update(profile_updates).eq("id", user_id))
+            # The update returns the new row, so there is no need to re-read it
+            updated_profile = update_res.data[0] if update_res.data else None
+            if updated_profile:
+                cache_profile(updated_profile)
+                index_user(updated_profile)
 
         # Update auth information if needed
         auth_update = {}   
@@ -45,20 +57,34 @@ async def update_user_service(
             auth_update["email"] = email
         if password is not None:
             auth_update["password"] = password
+
+        auth_user = None
         if auth_update:
-            supabase.auth.update_user(auth_update)
+            def update_own_auth(auth):
+                # Act as the caller with their own token, never through the admin
+                # API: GoTrue then keeps an email change pending until the new
+                # address is confirmed from the mail it sends
+                auth._save_session(Session(
+                    access_token=access_token,
+                    refresh_token="",
+                    expires_in=0,
+                    token_type="bearer",
+                    user=current_user,
+                ))
+                return auth.update_user(auth_update)
 
-        # Get updated profile
-        updated_profile = supabase.schema("revx").table("profile").select("*").eq("id", user_id).single().execute()
+            auth_user = (await run_auth(update_own_auth)).user
 
-        if not updated_profile.data:
+        if not updated_profile:
             raise HTTPException(status_code=404, detail="User not found after update")
         
         # Create a clean response dictionary
-        result = dict(updated_profile.data)
+        result = dict(updated_profile)
         
-        # Add the email to the response (either updated or current)
-        result["email"] = email if email is not None else current_email
+        # A new email only takes effect once confirmed, so report the current one
+        result["email"] = auth_user.email if auth_user and auth_user.email else current_email
+        if auth_user and auth_user.new_email:
+            result["pending_email"] = auth_user.new_email
         
         return result
     except HTTPException as e:
@@ -0,0 +1,61 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+import csv
+import io
+import orjson
+import zlib
+
+Pages = AsyncIterator[List[Dict[str, Any]]]
+
+# Spreadsheets evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_safe(value: Any) -> Any:
+    """Quote user-entered text that a spreadsheet would run as a formula"""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+async def ndjson_stream(pages: Pages) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per page"""
+    async for rows in pages:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+async def csv_stream(pages: Pages, columns: List[str]) -> AsyncIterator[bytes]:
+    """CSV with a header row; the buffer is reused, so memory stays at one page.
+    Text cells that look like formulas are prefixed with a quote."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+
+    def drain() -> bytes:
+        chunk = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return chunk
+
+    writer.writeheader()
+    yield drain()
+    async for rows in pages:
+        writer.writerows(
+            {column: _csv_safe(row.get(column)) for column in columns}
+            for row in rows
+        )
+        yield drain()
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly, flushing after every chunk so the
+    client keeps receiving data while the export is still being read"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            quality = params.strip().removeprefix("q=")
+            try:
+                return not params or float(quality) > 0
+            except ValueError:
+                return True
+    return False
@@ -0,0 +1,57 @@
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from dataclasses import dataclass
+from typing import Any, Optional
+import hashlib
+import orjson
+
+# Cache-Control policies per kind of route
+PUBLIC_LIST_CACHE_CONTROL = "public, max-age=15, stale-while-revalidate=60"
+PUBLIC_REVALIDATE_CACHE_CONTROL = "public, no-cache"
+PRIVATE_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+PUBLIC_STATIC_CACHE_CONTROL = "public, max-age=3600, stale-while-revalidate=86400"
+
+@dataclass(frozen=True)
+class RenderedJSON:
+    """A serialized JSON body together with its strong ETag"""
+    body: bytes
+    etag: str
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+def render_json(payload: Any) -> RenderedJSON:
+    body = orjson.dumps(jsonable_encoder(payload), option=orjson.OPT_NON_STR_KEYS)
+    return RenderedJSON(body=body, etag=make_etag(body))
+
+# Envelopes for JSON that Postgres already built; the payload bytes are copied
+# into the response as they are, never decoded and re-encoded
+_ENVELOPE_OPEN = b'{"status":"success"'
+
+def render_raw_data(data: bytes) -> RenderedJSON:
+    """{"status": "success", "data": <data>}"""
+    body = _ENVELOPE_OPEN + b',"data":' + data + b"}"
+    return RenderedJSON(body=body, etag=make_etag(body))
+
+def render_raw_members(members: bytes) -> RenderedJSON:
+    """Place the keys of a raw JSON object beside "status" at the top level"""
+    inner = members.strip()[1:-1].strip()
+    body = _ENVELOPE_OPEN + (b"," + inner if inner else b"") + b"}"
+    return RenderedJSON(body=body, etag=make_etag(body))
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+def conditional_json(request: Request, rendered: RenderedJSON, cache_control: str) -> Response:
+    """Answer 304 when the client already holds this body, otherwise send it"""
+    headers = {"ETag": rendered.etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=rendered.body, media_type="application/json", headers=headers)
@@ -0,0 +1,103 @@
+from typing import Any, Dict
+import httpx
+import random
+import threading
+import time
+
+# Gateway errors worth another try; anything else is the server's real answer
+_RETRY_STATUS = {502, 503, 504}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Failed before the request was sent; the inner HTTPTransport already retries these
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+class RetryTransport(httpx.BaseTransport):
+    """Pooled transport that retries idempotent requests with full-jitter backoff.
+
+    Only GET/HEAD/OPTIONS are retried, on transport errors after connecting and
+    on 502-504; writes and POST RPCs are sent exactly once. Connect failures are
+    left to the wrapped transport's own connect retries, so they are never
+    retried by both layers.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.HTTPTransport,
+        limits: httpx.Limits,
+        http2: bool,
+        retries: int = 2,
+        backoff: float = 0.1,
+    ):
+        self._transport = transport
+        self._limits = limits
+        self._http2 = http2
+        self._retries = retries
+        self._backoff = backoff
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._count("requests")
+        attempts = self._retries + 1 if request.method in _IDEMPOTENT_METHODS else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = self._transport.handle_request(request)
+            except _CONNECT_ERRORS:
+                self._count("failures")
+                raise
+            except httpx.TransportError:
+                if last:
+                    self._count("failures")
+                    raise
+            else:
+                if last or response.status_code not in _RETRY_STATUS:
+                    return response
+                response.close()
+            self._count("retries")
+            time.sleep(random.uniform(0, self._backoff * 2 ** attempt))
+
+    def close(self) -> None:
+        # Shared by several httpx clients; one of them closing must not
+        # tear down the pool for the rest. It lives for the whole process.
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection pool utilization and retry counters"""
+        pool = self._transport._pool
+        connections = list(pool.connections)
+        active = sum(1 for connection in connections if not connection.is_idle())
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            "http2": self._http2,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "keepalive_expiry": self._limits.keepalive_expiry,
+            "connections": len(connections),
+            "active": active,
+            "idle": len(connections) - active,
+            "queued_requests": len(getattr(pool, "_requests", [])),
+            **counters,
+        }
+
+def build_transport(
+    max_connections: int,
+    max_keepalive: int,
+    keepalive_expiry: float,
+    http2: bool,
+    retries: int,
+    backoff: float,
+    connect_retries: int,
+) -> RetryTransport:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+    # Connect failures are retried here for every method: nothing was sent yet
+    transport = httpx.HTTPTransport(http2=http2, limits=limits, retries=connect_retries)
+    return RetryTransport(transport, limits, http2, retries=retries, backoff=backoff)
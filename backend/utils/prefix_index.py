@@ -0,0 +1,56 @@
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Tuple
+
+class PrefixIndex:
+    """Sorted in-memory index answering case-insensitive prefix queries"""
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str]] = []
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+
+    @staticmethod
+    def _fold(label: str) -> str:
+        return label.casefold().strip()
+
+    def add(self, item_id: Hashable, label: str, payload: Any) -> None:
+        """Insert or replace an item; re-adding an id moves it to its new label"""
+        item_id = str(item_id)
+        self.remove(item_id)
+        if not label:
+            return
+        folded = self._fold(label)
+        self._entries[item_id] = (folded, payload)
+        insort(self._keys, (folded, item_id))
+
+    def remove(self, item_id: Hashable) -> None:
+        item_id = str(item_id)
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self._keys, (entry[0], item_id))
+        if position < len(self._keys) and self._keys[position] == (entry[0], item_id):
+            del self._keys[position]
+
+    def replace_all(self, items: List[Tuple[Hashable, str, Any]]) -> None:
+        """Rebuild the index from (id, label, payload) tuples in one pass"""
+        entries = {
+            str(item_id): (self._fold(label), payload)
+            for item_id, label, payload in items if label
+        }
+        self._keys = sorted((folded, item_id) for item_id, (folded, _) in entries.items())
+        self._entries = entries
+
+    def search(self, prefix: str, limit: int = 10) -> List[Any]:
+        prefix = self._fold(prefix)
+        results = []
+        position = bisect_left(self._keys, (prefix, ""))
+        while position < len(self._keys) and len(results) < limit:
+            folded, item_id = self._keys[position]
+            if not folded.startswith(prefix):
+                break
+            results.append(self._entries[item_id][1])
+            position += 1
+        return results
+
+    def __len__(self) -> int:
+        return len(self._entries)
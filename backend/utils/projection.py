@@ -0,0 +1,55 @@
+from fastapi import HTTPException
+from typing import FrozenSet, Iterable, List, Mapping, Optional
+
+# view=card asks the database for the slim grid projection: truncated
+# description, first image only, tags and rating, no owner lookup
+PROJECT_VIEWS = ("full", "card")
+PROJECT_VIEW_PATTERN = f"^({'|'.join(PROJECT_VIEWS)})$"
+
+# Keys each listing's SQL builds per view; keep in step with dbfunctions.sql
+_LIST_CARD_FIELDS = frozenset({
+    "id", "created_at", "title", "description", "avg_rating", "images", "tags",
+})
+PROJECT_LIST_FIELDS: Mapping[str, FrozenSet[str]] = {
+    "full": _LIST_CARD_FIELDS | {"owner_id", "owner"},
+    "card": _LIST_CARD_FIELDS,
+}
+PROJECT_SEARCH_FIELDS: Mapping[str, FrozenSet[str]] = {
+    view: names | {"rank"} for view, names in PROJECT_LIST_FIELDS.items()
+}
+_USER_CARD_FIELDS = frozenset({
+    "id", "title", "description", "created_at", "images", "tags",
+})
+USER_PROJECT_FIELDS: Mapping[str, FrozenSet[str]] = {
+    "full": _USER_CARD_FIELDS | {"owner_id"},
+    "card": _USER_CARD_FIELDS,
+}
+
+def parse_fields(
+    fields: Optional[str],
+    allowed: Mapping[str, FrozenSet[str]],
+    view: str,
+    required: Iterable[str] = (),
+) -> Optional[List[str]]:
+    """Parse a comma-separated sparse fieldset, or raise a 400 naming fields
+    the chosen view does not provide.
+
+    None means every field of the view; required keys are always kept.
+    """
+    if fields is None:
+        return None
+
+    names = []
+    for name in [*(field.strip() for field in fields.split(",")), *required]:
+        if name and name not in names:
+            names.append(name)
+
+    unknown = [name for name in names if name not in allowed[view]]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields for view={view}: {', '.join(unknown)}"
+        )
+    if not names:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    return names
@@ -0,0 +1,81 @@
+from utils.cache import TTLCache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+from dotenv import load_dotenv
+import threading
+import os
+
+load_dotenv()
+
+class ResponseCache:
+    """LRU/TTL cache for public read responses with tag-based invalidation.
+
+    Every entry remembers the version of each tag it depends on; invalidating
+    a tag bumps its version, so stale entries miss without scanning the cache.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 30.0):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+        self._route_stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _snapshot(self, tags: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+        return tuple((tag, self._versions.get(tag, 0)) for tag in tags)
+
+    def _record(self, route: str, hit: bool) -> None:
+        with self._lock:
+            stats = self._route_stats.setdefault(route, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def get(self, route: str, key: Hashable) -> Any:
+        entry = self._entries.get((route, key))
+        hit = entry is not None and all(
+            self._versions.get(tag, 0) == version for tag, version in entry[0]
+        )
+        self._record(route, hit)
+        return entry[1] if hit else None
+
+    async def get_or_load(
+        self,
+        route: str,
+        key: Hashable,
+        tags: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached value, or await `loader` and cache its result"""
+        value = self.get(route, key)
+        if value is not None:
+            return value
+
+        # Snapshot before loading so a write that lands mid-load still invalidates
+        snapshot = self._snapshot(tags)
+        value = await loader()
+        self._entries.set((route, key), (snapshot, value))
+        return value
+
+    def invalidate(self, *tags: str) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        routes = {}
+        for route, counts in self._route_stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            routes[route] = {
+                **counts,
+                "hit_ratio": round(counts["hits"] / lookups, 4) if lookups else 0.0,
+            }
+        return {**self._entries.stats(), "routes": routes}
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_SIZE", "512")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "30")),
+)
+
+# Tags shared by the routers that read and write project data
+CATALOG_TAG = "catalog"
+PROFILES_TAG = "profiles"
+
+def project_tag(project_id) -> str:
+    return f"project:{project_id}"
@@ -16,7 +16,7 @@ const MyProjectsList = () => {
       setIsLoading(true);
       setError(null);
       try {
-        const response = await getMyProjects(); // Use the correct API call
+        const response = await getMyProjects({ view: 'card' }); // Use the correct API call
         if (response.status === 'success') {
           setProjects(Array.isArray(response.data) ? response.data : []);
         } else {
@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { updateProject, getTags } from '../api/projects';
 import { Tag } from '../types/project';
 import { Tag as TagIcon, Check, X, Images, Trash2 } from 'lucide-react';
-import { uploadImageToStorage } from '../utils/imageUpload';
+import { uploadImagesToStorage } from '../utils/imageUpload';
 
 interface ProjectEditFormData {
   title: string;
@@ -134,14 +134,10 @@ const ProjectEditForm: React.FC<ProjectEditFormProps> = ({
       // Upload new images if any
       let uploadedImageUrls: string[] = [];
       if (newImages.length > 0) {
-        uploadedImageUrls = await Promise.all(
-          newImages.map(async (file) => {
-            const url = await uploadImageToStorage(file);
-            // Update progress smoothly
-            setUploadProgress((prev) => prev + (100 / newImages.length));
-            return url;
-          })
-        );
+        uploadedImageUrls = await uploadImagesToStorage(newImages, () => {
+          // Update progress smoothly
+          setUploadProgress((prev) => prev + (100 / newImages.length));
+        });
       }
 
       // Calculate final images list
@@ -1,7 +1,9 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../context/AuthContext';
-import { getAllUsers, toggleUserAdminStatus, deleteUser } from '../../api/admin';
+import { getAllUsers, toggleUserAdminStatus, deleteUser, getAdminJob, AdminJob } from '../../api/admin';
+
+const JOB_POLL_INTERVAL_MS = 1500;
 
 interface User {
   id: string;
@@ -20,6 +22,16 @@ const UserManagement = () => {
   const [error, setError] = useState<string | null>(null);
   const [actionInProgress, setActionInProgress] = useState<string | null>(null);
   const [confirmDelete, setConfirmDelete] = useState<string | null>(null);
+  // Deletions run as background jobs; rows stay listed until their job succeeds
+  const [pendingDeletes, setPendingDeletes] = useState<Record<string, AdminJob>>({});
+  const isMounted = useRef(true);
+
+  useEffect(() => {
+    isMounted.current = true;
+    return () => {
+      isMounted.current = false;
+    };
+  }, []);
 
   useEffect(() => {
     // Redirect non-admin users
@@ -59,12 +71,48 @@ const UserManagement = () => {
     }
   };
 
-  const handleDeleteUser = async (userId: string) => {
+  const clearPendingDelete = (userId: string) => {
+    setPendingDeletes(prev => {
+      const { [userId]: _, ...rest } = prev;
+      return rest;
+    });
+  };
+
+  const waitForDeletion = async (userId: string, username: string, jobId: string) => {
+    while (isMounted.current) {
+      await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+      if (!isMounted.current) return;
+
+      let job: AdminJob;
+      try {
+        job = await getAdminJob(jobId);
+      } catch (err: any) {
+        // Keep polling through transient errors; the job carries on server-side
+        console.error('Error polling deletion job:', err);
+        continue;
+      }
+
+      if (job.status === 'succeeded') {
+        setUsers(prev => prev.filter(user => user.id !== userId));
+        clearPendingDelete(userId);
+        return;
+      }
+      if (job.status === 'failed') {
+        setError(`Deleting ${username} failed: ${job.error || 'unknown error'}`);
+        clearPendingDelete(userId);
+        return;
+      }
+      setPendingDeletes(prev => ({ ...prev, [userId]: job }));
+    }
+  };
+
+  const handleDeleteUser = async (userId: string, username: string) => {
     try {
       setActionInProgress(userId);
-      await deleteUser(userId);
-      setUsers(users.filter(user => user.id !== userId));
+      const response = await deleteUser(userId);
       setConfirmDelete(null);
+      setPendingDeletes(prev => ({ ...prev, [userId]: response.data }));
+      waitForDeletion(userId, username, response.job_id);
     } catch (err: any) {
       setError(err.response?.data?.detail || 'Error deleting user');
     } finally {
@@ -72,6 +120,14 @@ const UserManagement = () => {
     }
   };
 
+  const deletionLabel = (job: AdminJob) => {
+    const done = job.progress?.completed_steps?.length ?? 0;
+    const total = job.progress?.total_steps;
+    return job.status === 'running' && total
+      ? `Deleting... (${done}/${total})`
+      : 'Deletion queued';
+  };
+
   // Format date to standard format
   const formatDate = (dateString: string) => {
     if (!dateString) return 'N/A';
@@ -154,8 +210,15 @@ const UserManagement = () => {
                     </td>
                     <td className="py-3 px-4">
                       <div className="flex space-x-2">
+                        {pendingDeletes[user.id] && (
+                          <span className="flex items-center px-3 py-1 text-sm rounded bg-gray-800 text-gray-300">
+                            <span className="animate-spin h-3 w-3 mr-2 border-t-2 border-white rounded-full"></span>
+                            {deletionLabel(pendingDeletes[user.id])}
+                          </span>
+                        )}
+
                         {/* Don't allow toggling admin status for the current user */}
-                        {user.id !== currentUser?.id && (
+                        {user.id !== currentUser?.id && !pendingDeletes[user.id] && (
                           <button
                             onClick={() => handleToggleAdmin(user.id, !user.is_admin)}
                             disabled={actionInProgress === user.id}
@@ -173,12 +236,12 @@ const UserManagement = () => {
                         )}
                         
                         {/* Don't allow deleting the current user */}
-                        {user.id !== currentUser?.id && (
+                        {user.id !== currentUser?.id && !pendingDeletes[user.id] && (
                           <>
                             {confirmDelete === user.id ? (
                               <div className="flex space-x-2">
                                 <button
-                                  onClick={() => handleDeleteUser(user.id)}
+                                  onClick={() => handleDeleteUser(user.id, user.username)}
                                   disabled={actionInProgress === user.id}
                                   className="px-3 py-1 text-sm rounded bg-red-700 hover:bg-red-600"
                                 >
@@ -1,47 +1,46 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { Search, X, Check, Tag, Star } from "lucide-react";
-import { getProjects, getTags } from "../api/projects";
+import { getProjects, getTags, searchProjects } from "../api/projects";
 import { Project, Tag as TagType } from "../types/project";
 
+const PAGE_SIZE = 24;
+const SEARCH_DEBOUNCE_MS = 300;
+
 const Explore = () => {
   const navigate = useNavigate();
   const [projects, setProjects] = useState<Project[]>([]);
-  const [filteredProjects, setFilteredProjects] = useState<Project[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isSearching, setIsSearching] = useState(false);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState("");
   const [availableTags, setAvailableTags] = useState<TagType[]>([]);
   const [selectedTagIds, setSelectedTagIds] = useState<string[]>([]);
+  // Only the latest request may update the grid; older responses are dropped
+  const requestId = useRef(0);
 
-  // Fetch projects and tags concurrently
-  useEffect(() => {
-    const fetchData = async () => {
-      setIsLoading(true);
-      setError(null);
+  // Searching and tag filtering happen on the server, over the whole catalog
+  const fetchPage = (cursor: string | null) => {
+    const term = searchTerm.trim();
+    if (term || selectedTagIds.length > 0) {
+      return searchProjects({
+        q: term || undefined,
+        tags: selectedTagIds,
+        limit: PAGE_SIZE,
+        cursor,
+        view: "card",
+      });
+    }
+    return getProjects({ limit: PAGE_SIZE, cursor, view: "card" });
+  };
 
+  // Fetch tags once
+  useEffect(() => {
+    const fetchTags = async () => {
       try {
-        const [projectResponse, tagResponse] = await Promise.all([
-          getProjects(),
-          getTags(),
-        ]);
-
-        if (
-          projectResponse &&
-          projectResponse.status === "success" &&
-          Array.isArray(projectResponse.data)
-        ) {
-          setProjects(projectResponse.data);
-        } else {
-          console.error("Failed to process projects:", projectResponse);
-          setError(
-            (prevError) =>
-              prevError || projectResponse?.message || "Failed to load projects"
-          );
-          setProjects([]);
-        }
-
-        // Process tag response
+        const tagResponse = await getTags();
         if (
           tagResponse &&
           tagResponse.status === "success" &&
@@ -65,59 +64,81 @@ const Explore = () => {
           setAvailableTags([]);
         }
       } catch (err: any) {
-        console.error("Error fetching data:", err);
-        setError(err.message || "Error loading data");
-        setProjects([]);
+        console.error("Error fetching tags:", err);
+        setError(err.message || "Error loading tags");
         setAvailableTags([]);
-      } finally {
-        setIsLoading(false);
       }
     };
 
-    fetchData();
+    fetchTags();
   }, []);
 
-  const clearTagFilters = () => {
-    setSelectedTagIds([]);
-  };
-
+  // Reload the first page whenever the search term or selected tags change
   useEffect(() => {
-    let results = projects;
+    const current = ++requestId.current;
+    setIsSearching(true);
 
-    // Apply search term filter
-    if (searchTerm) {
-      const term = searchTerm.toLowerCase();
-      results = results.filter((project) => {
-        const titleMatch = project.title.toLowerCase().includes(term);
-        const descMatch = project.description.toLowerCase().includes(term);
-        const tagMatch =
-          Array.isArray(project.tags) &&
-          project.tags.some((tag) => tag.tag_name.toLowerCase().includes(term));
-        return titleMatch || descMatch || tagMatch;
-      });
-    }
-
-    // Apply tag filter
-    if (selectedTagIds.length > 0) {
-      results = results.filter((project) => {
-        const projectHasTags =
-          Array.isArray(project.tags) && project.tags.length > 0;
-        if (!projectHasTags) return false;
+    const timer = setTimeout(async () => {
+      try {
+        const projectResponse = await fetchPage(null);
+        if (current !== requestId.current) return;
 
-        const match = project.tags.some((tag) => {
-          return (
-            typeof tag.tag_id !== "undefined" &&
-            selectedTagIds.includes(String(tag.tag_id))
+        if (
+          projectResponse &&
+          projectResponse.status === "success" &&
+          Array.isArray(projectResponse.data)
+        ) {
+          setProjects(projectResponse.data);
+          setNextCursor(projectResponse.next_cursor ?? null);
+        } else {
+          console.error("Failed to process projects:", projectResponse);
+          setError(
+            (prevError) =>
+              prevError || projectResponse?.message || "Failed to load projects"
           );
-        });
-        return match;
-      });
+          setProjects([]);
+          setNextCursor(null);
+        }
+      } catch (err: any) {
+        if (current !== requestId.current) return;
+        console.error("Error fetching projects:", err);
+        setError(err.response?.data?.detail || err.message || "Error loading projects");
+        setProjects([]);
+        setNextCursor(null);
+      } finally {
+        if (current === requestId.current) {
+          setIsSearching(false);
+          setIsLoading(false);
+        }
+      }
+    }, searchTerm ? SEARCH_DEBOUNCE_MS : 0);
+
+    return () => clearTimeout(timer);
+  }, [searchTerm, selectedTagIds]);
 
-      setFilteredProjects(results);
+  const loadMore = async () => {
+    if (!nextCursor || isLoadingMore) return;
+    const current = requestId.current;
+    setIsLoadingMore(true);
+
+    try {
+      const projectResponse = await fetchPage(nextCursor);
+      if (current !== requestId.current) return;
+      if (projectResponse?.status === "success" && Array.isArray(projectResponse.data)) {
+        setProjects((prev) => [...prev, ...projectResponse.data]);
+        setNextCursor(projectResponse.next_cursor ?? null);
+      }
+    } catch (err: any) {
+      console.error("Error loading more projects:", err);
+      setError(err.response?.data?.detail || err.message || "Error loading projects");
+    } finally {
+      setIsLoadingMore(false);
     }
+  };
 
-    setFilteredProjects(results);
-  }, [searchTerm, selectedTagIds, projects]);
+  const clearTagFilters = () => {
+    setSelectedTagIds([]);
+  };
 
   if (isLoading) {
     return (
@@ -223,7 +244,11 @@ const Explore = () => {
         </div>
 
         {/* Project Grid Display */}
-        {filteredProjects.length === 0 && !isLoading ? (
+        {isSearching && projects.length === 0 ? (
+          <div className="flex items-center justify-center py-16">
+            <div className="animate-spin rounded-full h-10 w-10 border-t-2 border-b-2 border-purple-500"></div>
+          </div>
+        ) : projects.length === 0 ? (
           <div className="text-center py-16">
             <h2 className="text-xl sm:text-2xl font-semibold mb-3 text-gray-400">
               No Matching Projects Found
@@ -233,8 +258,9 @@ const Explore = () => {
             </p>
           </div>
         ) : (
-          <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6">
-            {filteredProjects.map((project) => (
+          <>
+          <div className={`grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-6 transition-opacity ${isSearching ? "opacity-50" : ""}`}>
+            {projects.map((project) => (
               <div
                 key={project.id}
                 onClick={() => navigate(`/project/${project.id}`)}
@@ -293,6 +319,19 @@ const Explore = () => {
               </div>
             ))}
           </div>
+
+          {nextCursor && (
+            <div className="flex justify-center mt-10">
+              <button
+                onClick={loadMore}
+                disabled={isLoadingMore}
+                className="px-5 py-2 bg-purple-600 text-white rounded-lg hover:bg-purple-700 disabled:opacity-50 transition duration-150"
+              >
+                {isLoadingMore ? "Loading..." : "Load more"}
+              </button>
+            </div>
+          )}
+          </>
         )}
       </div>
     </div>
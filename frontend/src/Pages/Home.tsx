@@ -17,7 +17,8 @@ const HomePage = () => {
       setIsLoading(true);
       setError(null);
       try {
-        const response = await getProjects();
+        // The catalog is ordered by rating, so the first page is the top rated
+        const response = await getProjects({ limit, view: 'card' });
         if (response.status === 'success') {
           setProjects(Array.isArray(response.data) ? response.data : []);
         } else {
@@ -4,7 +4,7 @@ import { useNavigate } from 'react-router-dom';
 import { createProject, getTags } from '../api/projects';
 import { useAuth } from '../context/AuthContext';
 import { Images, Tag as TagIcon, Check, X } from 'lucide-react';
-import { uploadImageToStorage } from '../utils/imageUpload';
+import { uploadImagesToStorage } from '../utils/imageUpload';
 import { Tag } from '../types/project';
 
 const MAX_IMAGES = 10;
@@ -110,15 +110,10 @@ const Upload = () => {
 
         try {
             // Upload all images to Supabase Storage if there are any
-            const uploadedUrls = images.length > 0 ? 
-                await Promise.all(
-                    images.map(async (file, index) => {
-                        const url = await uploadImageToStorage(file);
-                        // Update progress smoothly
-                        setUploadProgress((prev) => prev + (100 / images.length));
-                        return url;
-                    })
-                ) : [];
+            const uploadedUrls = await uploadImagesToStorage(images, () => {
+                // Update progress smoothly
+                setUploadProgress((prev) => prev + (100 / images.length));
+            });
 
             // Validate that all selected tags exist in availableTags
             const validTagIds = selectedTagIds.filter(tagId => {
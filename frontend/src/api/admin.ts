@@ -17,6 +17,25 @@ export const getAdminMetrics = async (): Promise<AdminDashboardMetrics> => {
   return response.data;
 };
 
+export interface ActivityPoint {
+  bucket_start: string;
+  signups: number;
+  projects: number;
+  reviews: number;
+}
+
+export const getActivityTimeseries = async (
+  params: { from?: string; to?: string; bucket?: 'day' | 'week' } = {}
+): Promise<ActivityPoint[]> => {
+  const response = await apiClient.get('/admin/metrics/timeseries', { params });
+  return response.data.data;
+};
+
+export const reloadTags = async () => {
+  const response = await apiClient.post('/admin/tags/reload');
+  return response.data;
+};
+
 export const getAllUsers = async (limit: number = 100, offset: number = 0) => {
   const response = await apiClient.get(`/admin/users?limit=${limit}&offset=${offset}`);
   return response.data;
@@ -37,6 +56,33 @@ export const deleteUser = async (userId: string) => {
   return response.data;
 };
 
+export interface AdminJob {
+  id: string;
+  kind: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  progress: { completed_steps: string[]; total_steps: number };
+  result: Record<string, unknown> | null;
+  error: string | null;
+  created_at: string;
+  updated_at: string;
+}
+
+export const getAdminJob = async (jobId: string): Promise<AdminJob> => {
+  const response = await apiClient.get(`/admin/jobs/${jobId}`);
+  return response.data.data;
+};
+
+export const exportData = async (
+  kind: 'projects' | 'reviews' | 'users',
+  format: 'ndjson' | 'csv' = 'csv'
+): Promise<Blob> => {
+  const response = await apiClient.get(`/admin/export/${kind}`, {
+    params: { format },
+    responseType: 'blob',
+  });
+  return response.data;
+};
+
 export const deleteProject = async (projectId: string) => {
   const response = await apiClient.delete(`/admin/projects/${projectId}`);
   return response.data;
@@ -18,8 +18,42 @@ export interface ReviewData {
   rating: string;
 }
 
-export const getProjects = async () => {
-  const response = await apiClient.get('/project/list');
+export interface PageParams {
+  limit?: number;
+  cursor?: string | null;
+}
+
+// 'card' is the slim grid projection: short description, first image only, no owner
+export interface ViewParams {
+  view?: 'card' | 'full';
+  fields?: string[];
+}
+
+const viewParams = ({ view, fields }: ViewParams = {}) => ({
+  view,
+  fields: fields && fields.length ? fields.join(',') : undefined,
+});
+
+export const getProjects = async ({ view, fields, ...params }: PageParams & ViewParams = {}) => {
+  const response = await apiClient.get('/project/list', {
+    params: { ...params, ...viewParams({ view, fields }) },
+  });
+  return response.data;
+};
+
+export interface SearchParams extends PageParams, ViewParams {
+  q?: string;
+  tags?: string[];
+}
+
+export const searchProjects = async ({ tags, view, fields, ...params }: SearchParams) => {
+  const response = await apiClient.get('/project/search', {
+    params: {
+      ...params,
+      ...viewParams({ view, fields }),
+      tags: tags && tags.length ? tags.join(',') : undefined,
+    },
+  });
   return response.data;
 };
 
@@ -58,8 +92,8 @@ export const removeContributor = async (projectId: string, contributorId: string
   return response.data;
 };
 
-export const getMyProjects = async () => {
-  const response = await apiClient.get('/user/my_projects');
+export const getMyProjects = async (params?: ViewParams) => {
+  const response = await apiClient.get('/user/my_projects', { params: viewParams(params) });
   return response.data;
 };
 
@@ -51,6 +51,8 @@ export interface Project {
   reviews: Review[];
   images: string[];
   avg_rating?: number; // Ensure avg_rating is included if used elsewhere
+  review_count?: number;
+  rating_histogram?: Record<'1' | '2' | '3' | '4' | '5', number>;
 }
 
 export interface ProjectFormData {
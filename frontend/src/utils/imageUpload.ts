@@ -1,7 +1,31 @@
 import axios from 'axios';
 import { v4 as uuidv4 } from 'uuid';
+import apiClient from '../api/client';
 
-export const uploadImageToStorage = async (file: File): Promise<string> => {
+export interface UploadAuth {
+  token: string;
+  signature: string;
+  expire: number;
+}
+
+// One signed token per file, fetched in as few authenticated requests as possible.
+// The backend caps tokens per request (max_count), so keep asking for the rest.
+export const getUploadAuth = async (count: number): Promise<UploadAuth[]> => {
+  const auths: UploadAuth[] = [];
+  while (auths.length < count) {
+    const response = await apiClient.get('/api/imagekit/auth', {
+      params: { count: count - auths.length },
+    });
+    const tokens: UploadAuth[] = response.data.tokens || [];
+    if (tokens.length === 0) {
+      throw new Error('No upload signatures returned');
+    }
+    auths.push(...tokens);
+  }
+  return auths;
+};
+
+export const uploadImageToStorage = async (file: File, auth?: UploadAuth): Promise<string> => {
   try {
     // Log the process for debugging
     console.log("Starting upload for file:", file.name);
@@ -9,10 +33,8 @@ export const uploadImageToStorage = async (file: File): Promise<string> => {
     const fileExt = file.name.split('.').pop();
     const fileName = `${uuidv4()}.${fileExt}`;
     
-    // 1. Get auth tokens from backend
-    console.log("Getting auth tokens from:", `${import.meta.env.VITE_API_URL}/api/imagekit/auth`);
-    const authResponse = await axios.get(`${import.meta.env.VITE_API_URL}/api/imagekit/auth`);
-    const { signature, token, expire } = authResponse.data;
+    // 1. Get auth tokens from backend, unless the caller already has them
+    const { signature, token, expire } = auth ?? (await getUploadAuth(1))[0];
 
     // Log tokens WITHOUT revealing full signatures (security best practice)
     console.log("Full auth tokens for debugging:", { 
@@ -72,4 +94,20 @@ export const uploadImageToStorage = async (file: File): Promise<string> => {
     console.error('Error uploading image:', error);
     throw new Error(`Failed to upload image: ${error instanceof Error ? error.message : String(error)}`);
   }
-};
\ No newline at end of file
+};
+
+export const uploadImagesToStorage = async (
+  files: File[],
+  onUploaded?: (url: string, index: number) => void
+): Promise<string[]> => {
+  if (files.length === 0) return [];
+
+  const auths = await getUploadAuth(files.length);
+  return Promise.all(
+    files.map(async (file, index) => {
+      const url = await uploadImageToStorage(file, auths[index]);
+      onUploaded?.(url, index);
+      return url;
+    })
+  );
+};